@@ -0,0 +1,73 @@
+"""Compare per-session startup cost of the baseline's per-session Docker client vs the shared manager.
+
+Run from the repository root with a Docker daemon available:
+
+    python -m benchmarks.session_startup --sessions 20
+"""
+import os
+import json
+import argparse
+import time
+import docker
+from lib.JavaContainerManager import JavaContainerManager
+
+# Where the baseline kept its process state
+BASELINE_STATE_FILE = os.path.join(os.getcwd(), "java_app", "process_state.json")
+
+
+def baseline_session(container_name):
+    """What a new session did before the manager was shared: build its own
+    client, read the JSON process state and look the container up"""
+    client = docker.from_env()
+    if os.path.exists(BASELINE_STATE_FILE):
+        try:
+            with open(BASELINE_STATE_FILE, 'r') as f:
+                json.load(f)
+        except Exception:
+            pass
+    try:
+        client.containers.get(container_name).status
+    except docker.errors.NotFound:
+        pass
+    return client
+
+
+def per_session(sessions, container_name):
+    """Old behaviour: every session builds its own Docker client"""
+    clients = []
+    start = time.perf_counter()
+    for _ in range(sessions):
+        clients.append(baseline_session(container_name))
+    elapsed = time.perf_counter() - start
+    for client in clients:
+        client.close()
+    return elapsed
+
+
+def shared(sessions):
+    """New behaviour: one manager is created once and reused by every session"""
+    start = time.perf_counter()
+    manager = JavaContainerManager()
+    for _ in range(sessions):
+        manager.load_process_state()
+        manager.get_container_status()
+    elapsed = time.perf_counter() - start
+    manager.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--container", default="java-app-persistent")
+    args = parser.parse_args()
+
+    before = per_session(args.sessions, args.container)
+    after = shared(args.sessions)
+    print(f"sessions:              {args.sessions}")
+    print(f"per-session clients:   {before * 1000:8.1f} ms total, {before * 1000 / args.sessions:6.2f} ms/session")
+    print(f"shared manager:        {after * 1000:8.1f} ms total, {after * 1000 / args.sessions:6.2f} ms/session")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+import time
+
+
+class AdaptivePoller:
+    """Polling schedule that backs off exponentially while nothing changes"""
+
+    def __init__(self, min_interval=1.0, max_interval=30.0, factor=2.0, clock=time.monotonic):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.factor = factor
+        self.clock = clock
+        self.interval = min_interval
+        self.next_poll = clock()
+
+    def due(self):
+        """True when the next poll should happen"""
+        return self.clock() >= self.next_poll
+
+    def activity(self):
+        """Snap back to fast polling, e.g. when new log output was seen"""
+        self.interval = self.min_interval
+        self.next_poll = min(self.next_poll, self.clock() + self.min_interval)
+
+    def polled(self, changed):
+        """Record the outcome of a poll and schedule the next one"""
+        if changed:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * self.factor, self.max_interval)
+        self.next_poll = self.clock() + self.interval
@@ -0,0 +1,177 @@
+import numpy as np
+
+# "[yyyy-MM-dd HH:mm:ss] Loop N: message" as written by App.java
+LINE_PREFIX = b"] Loop "
+LOOP_OFFSET = 27
+MAX_LOOP_DIGITS = 10
+# Messages longer than this are interned by their first MESSAGE_MAX_BYTES bytes
+MESSAGE_MAX_BYTES = 256
+# Byte positions checked to recognise a line: "[" and "] Loop "
+_SHAPE_COLUMNS = np.array([0, 20, 21, 22, 23, 24, 25, 26])
+_SHAPE_BYTES = np.frombuffer(b"[" + LINE_PREFIX, dtype=np.uint8)
+# Byte positions of the timestamp digits: yyyy-MM-dd HH:mm:ss
+_TS_COLUMNS = np.array([1, 2, 3, 4, 6, 7, 9, 10, 12, 13, 15, 16, 18, 19])
+# Large chunks are parsed in slices of about this many bytes to bound temporaries
+PARSE_SLICE_BYTES = 4 * 1024 * 1024
+
+
+class ColumnBuffer:
+    """Append-only NumPy column with amortised doubling growth"""
+
+    def __init__(self, dtype, capacity=1024):
+        self._data = np.empty(capacity, dtype=dtype)
+        self._size = 0
+
+    def extend(self, values):
+        needed = self._size + len(values)
+        if needed > len(self._data):
+            grown = np.empty(max(needed, 2 * len(self._data)), dtype=self._data.dtype)
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+        self._data[self._size:needed] = values
+        self._size = needed
+
+    @property
+    def values(self):
+        """View of the filled part of the column"""
+        return self._data[:self._size]
+
+    def __len__(self):
+        return self._size
+
+
+def parse_chunk(chunk):
+    """Parse complete App.java log lines in bytes into column arrays.
+
+    Returns (timestamps int64 seconds, loops int32, message rows 'S' array,
+    line_numbers int64 relative to the chunk). Timestamps are the logged
+    wall-clock time counted as seconds since 1970-01-01 00:00:00 (no time
+    zone conversion). Lines in another format are skipped.
+    """
+    data = np.frombuffer(chunk, dtype=np.uint8)
+    newlines = np.flatnonzero(data == 10)
+    if len(newlines) == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty.astype(np.int32), np.empty(0, dtype='S1'), empty
+    starts = np.concatenate(([0], newlines[:-1] + 1))
+    ends = newlines
+    line_numbers = np.arange(len(starts), dtype=np.int64)
+
+    # Keep only lines long enough and shaped like "[....-..-.. ..:..:..] Loop "
+    ok = ends - starts > LOOP_OFFSET + 1
+    starts, ends, line_numbers = starts[ok], ends[ok], line_numbers[ok]
+    padded = np.concatenate((data, np.zeros(MESSAGE_MAX_BYTES + MAX_LOOP_DIGITS + 2, dtype=np.uint8)))
+    shape_ok = np.all(padded[starts[:, None] + _SHAPE_COLUMNS] == _SHAPE_BYTES, axis=1)
+    starts, ends, line_numbers = starts[shape_ok], ends[shape_ok], line_numbers[shape_ok]
+    digits = padded[starts[:, None] + _TS_COLUMNS].astype(np.int32) - ord('0')
+    shape_ok = np.all((digits >= 0) & (digits <= 9), axis=1)
+    starts, ends, line_numbers, digits = starts[shape_ok], ends[shape_ok], line_numbers[shape_ok], digits[shape_ok]
+
+    # Timestamp fields -> seconds, via datetime64 month/day arithmetic
+    d = digits.T
+    year = d[0] * 1000 + d[1] * 100 + d[2] * 10 + d[3]
+    month, day = d[4] * 10 + d[5], d[6] * 10 + d[7]
+    hour, minute, second = d[8] * 10 + d[9], d[10] * 10 + d[11], d[12] * 10 + d[13]
+    months = ((year - 1970) * 12 + month - 1).astype('datetime64[M]')
+    days = (months.astype('datetime64[D]') + (day - 1)).astype(np.int64)
+    timestamps = days * 86400 + (hour * 3600 + minute * 60 + second)
+
+    # Loop counter: the digit run after "Loop ", terminated by ':'
+    window = padded[starts[:, None] + (LOOP_OFFSET + np.arange(MAX_LOOP_DIGITS + 1))].astype(np.int16) - ord('0')
+    is_digit = (window >= 0) & (window <= 9)
+    length = np.argmin(is_digit, axis=1)
+    colon = window[np.arange(len(starts)), length] == ord(':') - ord('0')
+    valid = (length > 0) & colon
+    loops = np.zeros(len(starts), dtype=np.int64)
+    for column in range(MAX_LOOP_DIGITS):
+        active = column < length
+        loops = np.where(active, loops * 10 + window[:, column], loops)
+
+    # Message: from after ": " to the end of the line, as fixed-width rows
+    message_starts = starts + LOOP_OFFSET + length + 2
+    message_lengths = np.clip(ends - message_starts, 0, MESSAGE_MAX_BYTES)
+    width = max(int(message_lengths.max()) if len(message_lengths) else 1, 1)
+    columns = np.arange(width)
+    rows = padded[message_starts[:, None] + columns]
+    rows[columns >= message_lengths[:, None]] = 0
+    messages = rows.view(f'S{width}').ravel()
+
+    return (
+        timestamps[valid],
+        loops[valid].astype(np.int32),
+        messages[valid],
+        line_numbers[valid]
+    )
+
+
+class AppLogParser:
+    """Incremental parser of App.java output into columnar arrays.
+
+    Columns: timestamp (int64 seconds), loop (int32), message_id (int32,
+    interned in self.messages) and line (int64, 0-based line in the log).
+    """
+
+    def __init__(self):
+        self.timestamps = ColumnBuffer(np.int64)
+        self.loops = ColumnBuffer(np.int32)
+        self.message_ids = ColumnBuffer(np.int32)
+        self.lines = ColumnBuffer(np.int64)
+        self.messages = []
+        self._message_ids = {}
+        self.line_count = 0
+
+    def __len__(self):
+        return len(self.loops)
+
+    def feed(self, chunk, first_line=None):
+        """Parse a bytes chunk of complete lines that starts at line first_line"""
+        if first_line is None:
+            first_line = self.line_count
+        start = 0
+        while start < len(chunk):
+            end = chunk.rfind(b"\n", start, start + PARSE_SLICE_BYTES) + 1
+            if end <= start:
+                end = chunk.find(b"\n", start + PARSE_SLICE_BYTES) + 1 or len(chunk)
+            piece = chunk[start:end]
+            self._feed_slice(piece, first_line)
+            first_line += piece.count(b"\n")
+            start = end
+        self.line_count = first_line
+
+    def _feed_slice(self, chunk, first_line):
+        timestamps, loops, messages, line_numbers = parse_chunk(chunk)
+
+        # Intern per run of identical messages, not per line: only the first
+        # row of each run is looked up, everything else repeats its id
+        run_starts = np.flatnonzero(np.concatenate(([True], messages[1:] != messages[:-1]))) if len(messages) else np.empty(0, dtype=np.int64)
+        uniques, inverse = np.unique(messages[run_starts], return_inverse=True)
+        run_ids = np.repeat(inverse.ravel(), np.diff(np.append(run_starts, len(messages))))
+        mapping = np.empty(len(uniques), dtype=np.int32)
+        for i, message in enumerate(uniques):
+            message_id = self._message_ids.get(message)
+            if message_id is None:
+                message_id = self._message_ids[message] = len(self.messages)
+                self.messages.append(message.decode('utf-8', errors='replace'))
+            mapping[i] = message_id
+
+        self.timestamps.extend(timestamps)
+        self.loops.extend(loops)
+        self.message_ids.extend(mapping[run_ids])
+        self.lines.extend(line_numbers + first_line)
+
+    def gaps(self):
+        """Seconds between consecutive parsed iterations"""
+        return np.diff(self.timestamps.values)
+
+    def iteration_rate(self):
+        """Average iterations per second over the parsed range, or None"""
+        timestamps = self.timestamps.values
+        if len(timestamps) < 2 or timestamps[-1] == timestamps[0]:
+            return None
+        return (len(timestamps) - 1) / float(timestamps[-1] - timestamps[0])
+
+    def stalls(self, threshold_seconds):
+        """Return (loop, gap seconds) for every iteration that followed a gap above threshold"""
+        gaps = self.gaps()
+        where = np.flatnonzero(gaps > threshold_seconds)
+        return list(zip(self.loops.values[where + 1].tolist(), gaps[where].tolist()))
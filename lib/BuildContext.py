@@ -0,0 +1,126 @@
+import io
+import os
+import shlex
+import tarfile
+import hashlib
+import fnmatch
+
+# Image label carrying the hash of the build context the image was built from
+CONTEXT_HASH_LABEL = "java-app-monitoring.context-hash"
+
+
+def load_dockerignore(context_dir):
+    """Return the .dockerignore patterns of a build context as (pattern, negated) pairs"""
+    patterns = []
+    path = os.path.join(context_dir, ".dockerignore")
+    if not os.path.exists(path):
+        return patterns
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            negated = line.startswith('!')
+            pattern = os.path.normpath(line.lstrip('!').strip()).lstrip('/')
+            patterns.append((pattern, negated))
+    return patterns
+
+
+def is_ignored(rel_path, patterns):
+    """Apply .dockerignore rules to a context-relative path; the last matching rule wins"""
+    ignored = False
+    for pattern, negated in patterns:
+        if _matches(rel_path, pattern):
+            ignored = not negated
+    return ignored
+
+
+def _matches(rel_path, pattern):
+    if fnmatch.fnmatchcase(rel_path, pattern):
+        return True
+    if pattern.startswith('**/') and fnmatch.fnmatchcase(rel_path, pattern[3:]):
+        return True
+    # A pattern matching a directory excludes everything below it
+    parts = rel_path.split('/')
+    return any(fnmatch.fnmatchcase('/'.join(parts[:i]), pattern) for i in range(1, len(parts)))
+
+
+def list_context_files(context_dir):
+    """Return sorted context-relative paths of the files sent to the daemon"""
+    patterns = load_dockerignore(context_dir)
+    files = []
+    for root, dirs, names in os.walk(context_dir):
+        for name in names:
+            rel_path = os.path.relpath(os.path.join(root, name), context_dir).replace(os.sep, '/')
+            # The Dockerfile and .dockerignore always reach the daemon
+            if rel_path in ("Dockerfile", ".dockerignore") or not is_ignored(rel_path, patterns):
+                files.append(rel_path)
+    return sorted(files)
+
+
+def hash_context(context_dir, files=None):
+    """Return a SHA-256 over the names, modes and contents of the build context files"""
+    digest = hashlib.sha256()
+    for rel_path in files if files is not None else list_context_files(context_dir):
+        path = os.path.join(context_dir, rel_path)
+        digest.update(rel_path.encode('utf-8') + b"\0")
+        digest.update(oct(os.stat(path).st_mode & 0o777).encode('ascii') + b"\0")
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def dockerfile_sources(context_dir, dockerfile="Dockerfile"):
+    """Return the COPY/ADD source paths of a Dockerfile, or None if they can't be narrowed"""
+    sources = []
+    with open(os.path.join(context_dir, dockerfile), 'r') as f:
+        lines = f.read().replace("\\\n", " ").splitlines()
+    for line in lines:
+        parts = line.strip().split(None, 1)
+        if len(parts) < 2 or parts[0].upper() not in ("COPY", "ADD"):
+            continue
+        if parts[1].startswith('['):
+            return None
+        tokens = shlex.split(parts[1])
+        # Copies from another build stage don't read the context
+        if any(token.startswith('--from') for token in tokens):
+            continue
+        args = [token for token in tokens if not token.startswith('--')]
+        for source in args[:-1]:
+            if "://" in source:
+                continue
+            source = os.path.normpath(source).lstrip('/')
+            if source in ('.', ''):
+                return None
+            sources.append(source)
+    return sources
+
+
+def needed_context_files(context_dir, dockerfile="Dockerfile"):
+    """Return only the context files the Dockerfile actually copies, plus the Dockerfile"""
+    files = list_context_files(context_dir)
+    sources = dockerfile_sources(context_dir, dockerfile)
+    if sources is None:
+        return files
+    return [
+        rel_path for rel_path in files
+        if rel_path == dockerfile or any(_matches(rel_path, source) for source in sources)
+    ]
+
+
+def build_context_tar(context_dir, files):
+    """Pack the given context files into an in-memory gzip tar, returning the file object"""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode='w:gz') as tar:
+        for rel_path in files:
+            info = tar.gettarinfo(os.path.join(context_dir, rel_path), arcname=rel_path)
+            # Normalise ownership and times so identical inputs give identical contexts
+            info.uid = info.gid = 0
+            info.uname = info.gname = ""
+            info.mtime = 0
+            with open(os.path.join(context_dir, rel_path), 'rb') as f:
+                tar.addfile(info, f)
+    buffer.seek(0)
+    return buffer
@@ -0,0 +1,55 @@
+import re
+import time
+
+# "Step 3/5 : RUN javac App.java" as printed by the classic builder
+STEP_PATTERN = re.compile(r"^Step (\d+)/(\d+) : (.*)$")
+
+
+def parse_build_stream(chunks, clock=time.monotonic):
+    """Turn decoded low-level build output into step and result events.
+
+    Yields {'event': 'step', 'step', 'total', 'instruction', 'cached', 'duration', 'output'}
+    as each step finishes, then a single {'event': 'result', 'success', 'message', 'image_id'}.
+    """
+    current = None
+    image_id = None
+
+    def finish(step):
+        step['duration'] = clock() - step.pop('started')
+        return step
+
+    for chunk in chunks:
+        if 'error' in chunk:
+            if current is not None:
+                yield finish(current)
+            message = chunk.get('errorDetail', {}).get('message') or chunk['error']
+            yield {'event': 'result', 'success': False, 'message': f"Build Error: {message.strip()}", 'image_id': None}
+            return
+
+        if 'aux' in chunk and 'ID' in chunk['aux']:
+            image_id = chunk['aux']['ID']
+
+        for line in chunk.get('stream', '').splitlines():
+            line = line.rstrip()
+            match = STEP_PATTERN.match(line)
+            if match:
+                if current is not None:
+                    yield finish(current)
+                current = {
+                    'event': 'step',
+                    'step': int(match.group(1)),
+                    'total': int(match.group(2)),
+                    'instruction': match.group(3),
+                    'cached': False,
+                    'duration': None,
+                    'output': [],
+                    'started': clock()
+                }
+            elif current is not None and line:
+                if line.strip() == "---> Using cache":
+                    current['cached'] = True
+                current['output'].append(line)
+
+    if current is not None:
+        yield finish(current)
+    yield {'event': 'result', 'success': True, 'message': "Image built successfully", 'image_id': image_id}
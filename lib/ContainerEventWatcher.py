@@ -0,0 +1,158 @@
+import threading
+
+# Docker event action -> container status it leaves the container in
+ACTION_STATUS = {
+    'create': 'created',
+    'start': 'running',
+    'restart': 'running',
+    'unpause': 'running',
+    'pause': 'paused',
+    'die': 'exited',
+    'stop': 'exited',
+}
+
+
+class ContainerEventWatcher:
+    """Background subscriber to the Docker events stream keeping an in-memory status cache"""
+
+    def __init__(self, docker_client, reconnect_delay=2.0):
+        self.docker_client = docker_client
+        self.reconnect_delay = reconnect_delay
+        self._lock = threading.Lock()
+        self._statuses = {}
+        self._oom_killed = set()
+        self._execs = {}
+        self._ready = threading.Event()
+        self._stopped = threading.Event()
+        self._events = None
+        self._thread = None
+
+    def start(self):
+        """Start the watcher thread if it is not already running"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="docker-event-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the watcher thread and close the events stream"""
+        self._stopped.set()
+        self._ready.clear()
+        events = self._events
+        if events is not None:
+            try:
+                events.close()
+            except Exception:
+                pass
+
+    @property
+    def is_ready(self):
+        """True once the cache is seeded and the events stream is connected"""
+        return self._ready.is_set()
+
+    def get_status(self, name):
+        """Return the cached status of a container, or None if it doesn't exist"""
+        with self._lock:
+            return self._statuses.get(name)
+
+    def was_oom_killed(self, name):
+        """Return True if the container was killed by the OOM killer since it last started"""
+        with self._lock:
+            return name in self._oom_killed
+
+    def track_exec(self, exec_id, container_name, pid=None):
+        """Register an exec started by us so its exit is picked up from exec_die events.
+
+        Calling it again for a tracked exec only records the pid.
+        """
+        with self._lock:
+            info = self._execs.setdefault(
+                exec_id, {'Running': True, 'ExitCode': None, 'Pid': None, 'Container': container_name}
+            )
+            if pid is not None:
+                info['Pid'] = pid
+
+    def get_exec(self, exec_id):
+        """Return {'Running', 'ExitCode', 'Pid'} for a tracked exec, or None if untracked"""
+        with self._lock:
+            info = self._execs.get(exec_id)
+            return dict(info) if info else None
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                # Subscribe before seeding so nothing happens unseen in between
+                self._events = self.docker_client.events(decode=True, filters={'type': 'container'})
+                self._seed()
+                self._ready.set()
+                for event in self._events:
+                    self._handle(event)
+                    if self._stopped.is_set():
+                        break
+            except Exception:
+                pass
+            self._ready.clear()
+            self._stopped.wait(self.reconnect_delay)
+
+    def _seed(self):
+        statuses = {}
+        # Low-level list: one request, no per-container inspect
+        for summary in self.docker_client.api.containers(all=True):
+            for name in summary.get('Names', []):
+                statuses[name.lstrip('/')] = summary.get('State')
+        with self._lock:
+            self._statuses = statuses
+            running = [exec_id for exec_id, info in self._execs.items() if info['Running']]
+        # Exec exits may have been missed while disconnected: inspect the running ones once
+        for exec_id in running:
+            try:
+                inspect = self.docker_client.api.exec_inspect(exec_id)
+            except Exception:
+                inspect = None
+            with self._lock:
+                if inspect is None:
+                    # Gone with its container; callers fall back to inspecting it themselves
+                    self._execs.pop(exec_id, None)
+                elif exec_id in self._execs:
+                    self._execs[exec_id].update(Running=inspect.get('Running'), ExitCode=inspect.get('ExitCode'))
+
+    def _handle(self, event):
+        action = event.get('Action') or event.get('status') or ''
+        attributes = event.get('Actor', {}).get('Attributes', {})
+        name = attributes.get('name')
+        if not name:
+            return
+
+        with self._lock:
+            if action.startswith('exec_die'):
+                exec_id = attributes.get('execID')
+                if exec_id in self._execs:
+                    self._execs[exec_id].update(
+                        Running=False, ExitCode=_to_int(attributes.get('exitCode'))
+                    )
+            elif action == 'oom':
+                self._oom_killed.add(name)
+            elif action == 'destroy':
+                self._statuses.pop(name, None)
+                self._oom_killed.discard(name)
+            elif action == 'rename':
+                old_name = attributes.get('oldName', '').lstrip('/')
+                self._statuses[name] = self._statuses.pop(old_name, 'created')
+            elif ACTION_STATUS.get(action):
+                status = ACTION_STATUS[action]
+                self._statuses[name] = status
+                if status == 'running':
+                    self._oom_killed.discard(name)
+                elif status == 'exited':
+                    # Every exec dies with its container
+                    for info in self._execs.values():
+                        if info['Container'] == name and info['Running']:
+                            info['Running'] = False
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
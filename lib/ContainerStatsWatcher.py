@@ -0,0 +1,120 @@
+import time
+import threading
+from lib.TimeSeriesRing import MultiResolutionSeries
+
+MIB = 1024.0 * 1024.0
+STATS_COLUMNS = (
+    "cpu_percent", "mem_used_mb", "mem_limit_mb", "mem_percent",
+    "blk_read_bps", "blk_write_bps", "net_rx_bps", "net_tx_bps", "pids"
+)
+# 1s samples for 10 minutes, 10s means for an hour, 1 minute means for a day
+STATS_LEVELS = ((1, 600), (10, 360), (60, 1440))
+
+
+def cpu_percent(stats):
+    """CPU usage in percent of one core, from one stats frame and its precpu part"""
+    cpu, precpu = stats.get('cpu_stats', {}), stats.get('precpu_stats', {})
+    cpu_delta = cpu.get('cpu_usage', {}).get('total_usage', 0) - precpu.get('cpu_usage', {}).get('total_usage', 0)
+    system_delta = cpu.get('system_cpu_usage', 0) - precpu.get('system_cpu_usage', 0)
+    if cpu_delta <= 0 or system_delta <= 0:
+        return 0.0
+    online = cpu.get('online_cpus') or len(cpu.get('cpu_usage', {}).get('percpu_usage') or []) or 1
+    return cpu_delta / float(system_delta) * online * 100.0
+
+
+def memory_used(stats):
+    """Memory in use without the page cache that can be reclaimed, as docker stats reports it"""
+    memory = stats.get('memory_stats', {})
+    details = memory.get('stats', {})
+    # cgroup v2 reports inactive_file, v1 total_inactive_file
+    cache = details.get('inactive_file', details.get('total_inactive_file', 0))
+    return max(memory.get('usage', 0) - cache, 0)
+
+
+def io_totals(stats):
+    """Cumulative (block read, block write, network rx, network tx) bytes"""
+    read = write = 0
+    for entry in (stats.get('blkio_stats', {}).get('io_service_bytes_recursive') or []):
+        op = entry.get('op', '').lower()
+        if op == 'read':
+            read += entry.get('value', 0)
+        elif op == 'write':
+            write += entry.get('value', 0)
+    networks = (stats.get('networks') or {}).values()
+    rx = sum(network.get('rx_bytes', 0) for network in networks)
+    tx = sum(network.get('tx_bytes', 0) for network in networks)
+    return read, write, rx, tx
+
+
+class ContainerStatsWatcher:
+    """Background consumer of a container's streamed stats.
+
+    Each stats frame becomes one sample of STATS_COLUMNS (I/O as bytes/s
+    deltas) in a MultiResolutionSeries, so readers never wait on Docker.
+    The stream is reopened after the container restarts.
+    """
+
+    def __init__(self, docker_client, container_name, reconnect_delay=2.0):
+        self.docker_client = docker_client
+        self.container_name = container_name
+        self.reconnect_delay = reconnect_delay
+        self.series = MultiResolutionSeries(STATS_COLUMNS, STATS_LEVELS)
+        self.last_sample = None
+        self.last_error = None
+        self._previous = None
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start consuming the stats stream in a background thread"""
+        if self.is_running:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name=f"container-stats:{self.container_name}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop after the next stats frame; collected samples are kept"""
+        self._stopped.set()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                for stats in self.docker_client.api.stats(self.container_name, decode=True, stream=True):
+                    if self._stopped.is_set():
+                        return
+                    self._handle(stats)
+            except Exception as e:
+                self.last_error = str(e)
+            # Stream ended (container stopped) or failed: rates restart from scratch
+            self._previous = None
+            self._stopped.wait(self.reconnect_delay)
+
+    def _handle(self, stats):
+        now = time.time()
+        totals = io_totals(stats)
+        limit = stats.get('memory_stats', {}).get('limit', 0)
+        used = memory_used(stats)
+        sample = {
+            'cpu_percent': cpu_percent(stats),
+            'mem_used_mb': used / MIB,
+            'mem_limit_mb': limit / MIB,
+            'mem_percent': used * 100.0 / limit if limit else 0.0,
+            'pids': stats.get('pids_stats', {}).get('current', 0)
+        }
+        if self._previous is not None:
+            previous_time, previous_totals = self._previous
+            elapsed = now - previous_time
+            if elapsed > 0:
+                for column, value, previous in zip(
+                    ("blk_read_bps", "blk_write_bps", "net_rx_bps", "net_tx_bps"), totals, previous_totals
+                ):
+                    sample[column] = max(value - previous, 0) / elapsed
+        self._previous = (now, totals)
+        self.series.append(now, sample)
+        self.last_sample = sample
+        self.last_error = None
@@ -0,0 +1,144 @@
+import os
+import re
+import numpy as np
+from lib.AppLogParser import ColumnBuffer
+
+# -Xlog output the parser expects: uptime decoration, no rotation so the file only grows
+GC_LOG_OPTION = "-Xlog:gc*:file={path}:uptime,level,tags:filecount=0"
+# "[12.345s][info][gc] GC(3) Pause Young (Normal) (G1 Evacuation Pause) 24M->3M(256M) 3.456ms"
+# The pattern starts with a literal so the regex engine can skip ahead quickly;
+# the uptime is then read from the start of each matching line
+PAUSE_PATTERN = re.compile(
+    rb"\] GC\((\d+)\) (Pause [^\n]*?) (\d+)([KMG])->(\d+)([KMG])\((\d+)([KMG])\) (\d+\.\d+)ms$",
+    re.MULTILINE
+)
+UPTIME_PATTERN = re.compile(rb"\[(\d+\.\d+)s\]")
+UNIT_MB = {b"K": 1.0 / 1024, b"M": 1.0, b"G": 1024.0}
+# Bytes read per slice when catching up on a large log
+READ_SLICE_BYTES = 8 * 1024 * 1024
+
+
+class GcLogParser:
+    """Incremental parser of unified JVM GC logs (-Xlog:gc*) into pause columns.
+
+    Columns: uptime (s), gc_id, kind_id (interned in self.kinds, e.g.
+    "Pause Young (Normal) (G1 Evacuation Pause)"), duration_ms and heap
+    before / after / committed in MiB. Only pause lines are kept; concurrent
+    phases and other tags are skipped.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Drop all parsed pauses and start again from the beginning of the file"""
+        self.uptimes = ColumnBuffer(np.float64)
+        self.gc_ids = ColumnBuffer(np.int32)
+        self.kind_ids = ColumnBuffer(np.int16)
+        self.durations = ColumnBuffer(np.float64)
+        self.heap_before = ColumnBuffer(np.float64)
+        self.heap_after = ColumnBuffer(np.float64)
+        self.heap_committed = ColumnBuffer(np.float64)
+        self.kinds = []
+        self._kind_ids = {}
+        self.offset = 0
+        self.inode = None
+        self._partial = b""
+
+    def __len__(self):
+        return len(self.durations)
+
+    def feed(self, chunk):
+        """Parse a bytes chunk of complete lines"""
+        rows = []
+        for match in PAUSE_PATTERN.finditer(chunk):
+            line_start = chunk.rfind(b"\n", 0, match.start()) + 1
+            uptime = UPTIME_PATTERN.search(chunk, line_start, match.start())
+            if uptime is not None:
+                rows.append((uptime.group(1),) + match.groups())
+        if not rows:
+            return
+        uptime, gc_id, kind, before, before_unit, after, after_unit, committed, committed_unit, duration = zip(*rows)
+        kind_ids = []
+        for name in kind:
+            kind_id = self._kind_ids.get(name)
+            if kind_id is None:
+                kind_id = self._kind_ids[name] = len(self.kinds)
+                self.kinds.append(name.decode('utf-8', errors='replace'))
+            kind_ids.append(kind_id)
+        self.uptimes.extend(np.array(uptime, dtype=np.float64))
+        self.gc_ids.extend(np.array(gc_id, dtype=np.int32))
+        self.kind_ids.extend(kind_ids)
+        self.durations.extend(np.array(duration, dtype=np.float64))
+        self.heap_before.extend(_to_mb(before, before_unit))
+        self.heap_after.extend(_to_mb(after, after_unit))
+        self.heap_committed.extend(_to_mb(committed, committed_unit))
+
+    def update_from_file(self, gc_log_file, max_bytes=256 * 1024 * 1024):
+        """Parse what was appended to gc_log_file since the last call, at most max_bytes.
+
+        Starts over if the file was replaced or truncated. Returns the
+        number of bytes read, so callers can tell whether they caught up.
+        """
+        try:
+            stat = os.stat(gc_log_file)
+        except OSError:
+            return 0
+        if stat.st_ino != self.inode or stat.st_size < self.offset:
+            self.reset()
+            self.inode = stat.st_ino
+
+        read = 0
+        with open(gc_log_file, 'rb') as f:
+            f.seek(self.offset)
+            while read < max_bytes:
+                data = f.read(min(READ_SLICE_BYTES, max_bytes - read))
+                if not data:
+                    break
+                read += len(data)
+                self.offset += len(data)
+                data = self._partial + data
+                cut = data.rfind(b"\n") + 1
+                self._partial = data[cut:]
+                self.feed(data[:cut])
+        return read
+
+    def pause_percentiles(self, percentiles=(50, 95, 99, 100)):
+        """Pause durations in ms at the given percentiles, or None without pauses"""
+        if len(self) == 0:
+            return None
+        return dict(zip(percentiles, np.percentile(self.durations.values, percentiles).tolist()))
+
+    def allocation_rate(self, window=None):
+        """MiB allocated per second between pauses, optionally over the last window seconds"""
+        uptimes = self.uptimes.values
+        before, after = self.heap_before.values, self.heap_after.values
+        if window is not None and len(uptimes):
+            start = np.searchsorted(uptimes, uptimes[-1] - window)
+            uptimes, before, after = uptimes[start:], before[start:], after[start:]
+        if len(uptimes) < 2 or uptimes[-1] == uptimes[0]:
+            return None
+        # Heap grows only by allocation between the end of one pause and the start of the next
+        allocated = np.clip(before[1:] - after[:-1], 0, None).sum()
+        return float(allocated) / (uptimes[-1] - uptimes[0])
+
+    def pause_overhead(self):
+        """Fraction of JVM uptime spent in pauses, or None"""
+        uptimes = self.uptimes.values
+        if len(uptimes) == 0 or uptimes[-1] == 0:
+            return None
+        return float(self.durations.values.sum()) / 1000.0 / uptimes[-1]
+
+    def kind_summary(self):
+        """Return [(kind, count, total ms, max ms)] ordered by total pause time"""
+        kind_ids, durations = self.kind_ids.values, self.durations.values
+        summary = []
+        for kind_id, kind in enumerate(self.kinds):
+            selected = durations[kind_ids == kind_id]
+            if len(selected):
+                summary.append((kind, len(selected), float(selected.sum()), float(selected.max())))
+        return sorted(summary, key=lambda row: row[2], reverse=True)
+
+
+def _to_mb(values, units):
+    return np.array(values, dtype=np.float64) * np.array([UNIT_MB[unit] for unit in units])
@@ -0,0 +1,126 @@
+import math
+import time
+from collections import deque
+import numpy as np
+from lib.AppLogParser import parse_chunk
+
+
+class LatencyHistogram:
+    """Fixed-size log-bucketed histogram (HDR style) for streaming percentiles.
+
+    Bucket i covers values up to ratio**i, so any percentile is reported
+    within a relative error of (ratio - 1), with memory independent of the
+    number of values recorded.
+    """
+
+    def __init__(self, max_value=3600 * 1000, ratio=1.02):
+        self.ratio = ratio
+        self._log_ratio = math.log(ratio)
+        self.bucket_count = int(math.ceil(math.log(max_value) / self._log_ratio)) + 1
+        self.counts = np.zeros(self.bucket_count, dtype=np.int64)
+        self.total = 0
+
+    def record_many(self, values):
+        """Record an array of non-negative values"""
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return
+        buckets = np.ceil(np.log(np.maximum(values, 1.0)) / self._log_ratio).astype(np.int64)
+        np.clip(buckets, 0, self.bucket_count - 1, out=buckets)
+        self.counts += np.bincount(buckets, minlength=self.bucket_count)
+        self.total += len(values)
+
+    def percentile(self, q):
+        """Upper bound of the bucket holding the q-th percentile (0-100), or None"""
+        if self.total == 0:
+            return None
+        rank = max(1, int(math.ceil(q / 100.0 * self.total)))
+        bucket = int(np.searchsorted(np.cumsum(self.counts), rank))
+        return 0.0 if bucket == 0 else self.ratio ** bucket
+
+
+class IterationStats:
+    """Constant-memory throughput and stall statistics over tailed App.java lines.
+
+    Fed with raw bytes of complete lines (the same stream as the log indexes),
+    it keeps an inter-iteration gap histogram in milliseconds, per-second
+    iteration counts over the last rate_window seconds and the most recent
+    stalls. Gaps come from the logged timestamps, so they have one-second
+    resolution.
+    """
+
+    def __init__(self, stall_threshold=2.0, rate_window=60, max_stalls=20):
+        self.stall_threshold = stall_threshold
+        self.rate_window = rate_window
+        self.gaps = LatencyHistogram()
+        self.iterations = 0
+        self.first_timestamp = None
+        self.last_timestamp = None
+        self.last_loop = None
+        self.last_seen_at = None
+        self.max_gap = 0
+        self.stalls = deque(maxlen=max_stalls)
+        self.stall_count = 0
+        self.line_count = 0
+        self._second_counts = np.zeros(rate_window, dtype=np.int64)
+        self._second_stamps = np.full(rate_window, -1, dtype=np.int64)
+
+    def feed(self, data, first_line):
+        """Update the statistics with complete lines starting at line first_line"""
+        timestamps, loops, _, _ = parse_chunk(data)
+        self.line_count = first_line + data.count(b"\n")
+        if len(timestamps) == 0:
+            return
+
+        # Gap before each iteration; the very first iteration has none
+        if self.last_timestamp is None:
+            gaps = np.diff(timestamps)
+            after = slice(1, None)
+        else:
+            gaps = np.diff(timestamps, prepend=self.last_timestamp)
+            after = slice(None)
+        self.gaps.record_many(gaps * 1000)
+        if len(gaps):
+            self.max_gap = max(self.max_gap, int(gaps.max()))
+        stalled = np.flatnonzero(gaps > self.stall_threshold)
+        self.stall_count += len(stalled)
+        for loop, gap, timestamp in zip(loops[after][stalled], gaps[stalled], timestamps[after][stalled]):
+            self.stalls.append((int(loop), int(gap), int(timestamp)))
+
+        # Per-second ring: a slot holding an older second is reset before counting
+        seconds, counts = np.unique(timestamps, return_counts=True)
+        recent = seconds > seconds[-1] - self.rate_window
+        seconds, counts = seconds[recent], counts[recent]
+        slots = seconds % self.rate_window
+        stale = self._second_stamps[slots] != seconds
+        self._second_counts[slots[stale]] = 0
+        self._second_stamps[slots] = seconds
+        self._second_counts[slots] += counts
+
+        if self.first_timestamp is None:
+            self.first_timestamp = int(timestamps[0])
+        self.last_timestamp = int(timestamps[-1])
+        self.last_loop = int(loops[-1])
+        self.iterations += len(timestamps)
+        self.last_seen_at = time.time()
+
+    def recent_rate(self):
+        """Iterations per second over the last rate_window logged seconds, or None"""
+        if self.last_timestamp is None:
+            return None
+        oldest = self.last_timestamp - self.rate_window + 1
+        in_window = self._second_stamps >= oldest
+        span = self.last_timestamp - max(oldest, self.first_timestamp) + 1
+        return float(self._second_counts[in_window].sum()) / span
+
+    def overall_rate(self):
+        """Iterations per second over the whole run, or None"""
+        if self.last_timestamp is None or self.last_timestamp == self.first_timestamp:
+            return None
+        return (self.iterations - 1) / float(self.last_timestamp - self.first_timestamp)
+
+    def seconds_since_last_iteration(self):
+        """Host seconds since the tailer last saw an iteration, or None"""
+        if self.last_seen_at is None:
+            return None
+        return time.time() - self.last_seen_at
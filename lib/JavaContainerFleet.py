@@ -0,0 +1,142 @@
+import os
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from lib.JavaContainerManager import FLEET_LABEL
+
+
+class JavaContainerFleet:
+    """Launch, track and stop N named Java containers concurrently"""
+
+    def __init__(self, manager, fleet_name="java-app-fleet", max_workers=64):
+        self.manager = manager
+        self.fleet_name = fleet_name
+        # Upper bound on concurrent Docker calls; keep it within the manager's connection pool
+        self.max_workers = max_workers
+        self.fleet_dir = os.path.join(os.getcwd(), "java_app", "fleet", fleet_name)
+
+    def container_names(self, count):
+        """Return the container names for a fleet of the given size"""
+        return [f"{self.fleet_name}-{i}" for i in range(1, count + 1)]
+
+    def log_file(self, name):
+        """Host log file bind-mounted into the named container"""
+        return os.path.join(self.fleet_dir, f"{name}.log")
+
+    def state_file(self, name):
+        """Per-container state file"""
+        return os.path.join(self.fleet_dir, f"{name}.json")
+
+    def load_state(self, name):
+        """Load the persisted state of one fleet container"""
+        try:
+            with open(self.state_file(name), 'r') as f:
+                return json.load(f)
+        except Exception:
+            return None
+
+    def save_state(self, name, state):
+        """Persist the state of one fleet container"""
+        os.makedirs(self.fleet_dir, exist_ok=True)
+        tmp_file = self.state_file(name) + ".tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_file, self.state_file(name))
+
+    def members(self):
+        """Return the names of all containers with saved fleet state"""
+        if not os.path.isdir(self.fleet_dir):
+            return []
+        names = [f[:-len(".json")] for f in os.listdir(self.fleet_dir) if f.endswith(".json")]
+        return sorted(names, key=lambda name: (len(name), name))
+
+    def _map(self, func, names):
+        if not names:
+            return []
+        # One worker per container up to max_workers, so a fleet is handled in one round
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(names))) as pool:
+            return list(pool.map(func, names))
+
+    def launch(self, count, log_message, iterations):
+        """Start the Java app in count containers concurrently.
+
+        Returns a list of (name, success, message) tuples.
+        """
+        os.makedirs(self.fleet_dir, exist_ok=True)
+
+        def launch_one(name):
+            try:
+                log_file = self.log_file(name)
+                self.manager.prepare_log_file(log_file, archive=False)
+                container, action = self.manager.get_or_create_container(
+                    log_message, iterations, log_file,
+                    container_name=name, labels={FLEET_LABEL: self.fleet_name}
+                )
+                success, message = self.manager.execute_java_app(container, log_message, iterations)
+                if success:
+                    self.save_state(name, {
+                        'container_name': name,
+                        'log_file': log_file,
+                        'start_time': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                        'exec_id': self.manager.get_java_exec_id(name),
+                        'log_message': log_message,
+                        'iterations': iterations
+                    })
+                return name, success, f"{message} ({action} container)"
+            except Exception as e:
+                return name, False, f"Failed to launch: {e}"
+
+        return self._map(launch_one, self.container_names(count))
+
+    def status(self):
+        """Return one status row per fleet container.
+
+        Container states come from one labelled list call and Java liveness
+        from exec inspections fanned out over the manager's thread pool.
+        Members without a launched exec are reported stopped without a check.
+        """
+        names = self.members()
+        states = {name: self.load_state(name) or {} for name in names}
+        for name, state in states.items():
+            self.manager.set_java_exec_id(name, state.get('exec_id'))
+        launched = [name for name in names if self.manager.get_java_exec_id(name)]
+
+        statuses = self.manager.get_container_statuses(names, label=f"{FLEET_LABEL}={self.fleet_name}")
+        running = [name for name in launched if statuses.get(name) == 'running']
+        java_running = self.manager.are_java_processes_running(running, self.max_workers)
+        stopped = [name for name in launched if not java_running.get(name)]
+        exit_codes = self.manager.get_java_exit_codes(stopped, self.max_workers)
+
+        rows = []
+        for name in names:
+            is_running = java_running.get(name, False)
+            rows.append({
+                'Container': name,
+                'Status': statuses.get(name) or "missing",
+                'Java': "running" if is_running else "stopped",
+                'Exit Code': exit_codes.get(name),
+                'Started': states[name].get('start_time'),
+                'Log Size (KiB)': round(_file_size(states[name].get('log_file')) / 1024, 1)
+            })
+        return rows
+
+    def stop(self):
+        """Stop the Java app in every fleet container"""
+        return self._map(lambda name: (name, *self.manager.stop_java_app(name)), self.members())
+
+    def remove(self):
+        """Remove every fleet container and forget its state"""
+        def remove_one(name):
+            success, message = self.manager.remove_container(name)
+            if success and os.path.exists(self.state_file(name)):
+                os.remove(self.state_file(name))
+            return name, success, message
+
+        return self._map(remove_one, self.members())
+
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except (OSError, TypeError):
+        return 0
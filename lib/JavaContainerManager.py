@@ -1,44 +1,249 @@
 import os
-import json
+import re
+import mmap
 import time
+import shutil
+import tempfile
+import threading
 import docker
+from bisect import bisect_right
+from collections import OrderedDict
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from lib.LogTailer import LogTailer
+from lib.LogWatcher import LogWatcher
+from lib.MappedLog import MappedLog, remove_index_files
+from lib.LogSearchIndex import LogSearchIndex, query_terms
+from lib.AppLogParser import AppLogParser
+from lib.IterationStats import IterationStats
+from lib.LogArchive import ArchivedLog, apply_retention
+from lib.LogArchive import archive_log as archive_log_file, list_archived_runs as list_archive_dir
+from lib.ContainerEventWatcher import ContainerEventWatcher
+from lib.BuildContext import CONTEXT_HASH_LABEL, hash_context, needed_context_files, build_context_tar
+from lib.BuildProgress import parse_build_stream
+from lib.RunRegistry import RunRegistry
+from lib.JvmMetrics import JvmMetricsSampler
+from lib.ContainerStatsWatcher import ContainerStatsWatcher
+from lib.GcLogParser import GcLogParser, GC_LOG_OPTION
+from lib.JfrRecorder import JfrRecorder, java_shell_command
+from lib.ThreadDump import ThreadDump
+
+# Labels stamped on containers created by the manager
+MANAGED_LABEL = "java-app-monitoring.managed"
+FLEET_LABEL = "java-app-monitoring.fleet"
+# Directory bind-mounted into the container for the JVM's GC log
+CONTAINER_GC_DIR = "/app/gc"
+GC_LOG_NAME = "gc.log"
+# Bytes of new log lines fed to a derived index per lock acquisition
+DERIVED_FEED_BYTES = 4 * 1024 * 1024
+
 
 class JavaContainerManager:
-    def __init__(self, container_name="java-app-persistent"):
-        self.docker_client = docker.from_env()
+    # One Docker events subscription per process, shared by all managers
+    _event_watcher = None
+    _event_watcher_lock = threading.Lock()
+    
+    def __init__(self, container_name="java-app-persistent", max_pool_size=64,
+                 max_archived_runs=50, max_archive_bytes=2 * 1024 ** 3, max_archive_age_days=30,
+                 max_search_indexes=2, stall_threshold=2.0):
+        # One pooled connection set, sized for concurrent script threads and fleet fan-out
+        self.docker_client = docker.from_env(max_pool_size=max_pool_size)
         self.container_name = container_name
-        self.state_file = os.path.join(os.getcwd(), "java_app", "process_state.json")
+        # Run history (and the active run per container) lives in SQLite
+        self.registry = RunRegistry(os.path.join(os.getcwd(), "java_app", "runs.db"))
+        # Completed run logs are rotated here, compressed, under a retention policy
+        self.archive_dir = os.path.join(os.getcwd(), "java_app", "archive")
+        self.max_archived_runs = max_archived_runs
+        self.max_archive_bytes = max_archive_bytes
+        self.max_archive_age_days = max_archive_age_days
+        # Compresses rotated logs one at a time, off the request path
+        self._archiver = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log-archiver")
+        # Guards the archive and exec bookkeeping when shared across sessions
+        self._lock = threading.RLock()
+        # Serializes feeding derived log indexes, which runs outside _lock
+        self._feed_lock = threading.Lock()
+        # Serializes line index scans, which also run outside _lock
+        self._index_lock = threading.Lock()
+        # Exec instance ID of the Java app per container, answered via exec inspect
+        self.java_exec_ids = {}
+        self.event_watcher = self._get_event_watcher(self.docker_client)
+        # One change watcher per log file, shared by every tailer of that file
+        self.log_watchers = {}
+        # Line indexes kept up to date (and persisted) while runs are tailed
+        self.log_indexes = {}
+        # Inverted (token -> lines) indexes, fed as lines arrive and evicted
+        # least recently used first
+        self.log_search_indexes = OrderedDict()
+        self.max_search_indexes = max_search_indexes
+        # Columnar parse of App.java lines (timestamp, loop, message id), built on request
+        self.log_columns = {}
+        # Constant-memory throughput / stall statistics per log
+        self.log_iteration_stats = {}
+        self.iteration_stats_factory = partial(IterationStats, stall_threshold=stall_threshold)
+        # Background heap / GC / thread samplers per container
+        self.jvm_samplers = {}
+        # Streamed CPU / memory / I/O stats per watched container
+        self.stats_watchers = {}
+        # Incremental GC pause parsers per GC log file, each with its own lock
+        self.gc_logs = {}
+        # Latest Flight Recorder capture per container; recordings are copied here
+        self.java_profilers = {}
+        self.profile_dir = os.path.join(os.getcwd(), "java_app", "profiles")
+        # Raw thread dumps, one directory per run
+        self.thread_dump_dir = os.path.join(os.getcwd(), "java_app", "thread_dumps")
+    
+    def close(self):
+        """Stop background watchers and release the Docker connection pool"""
+        with JavaContainerManager._event_watcher_lock:
+            if JavaContainerManager._event_watcher is self.event_watcher:
+                JavaContainerManager._event_watcher = None
+        self.event_watcher.stop()
+        with self._lock:
+            for watcher in self.log_watchers.values():
+                watcher.stop()
+            self.log_watchers.clear()
+            for index in self.log_indexes.values():
+                index.close()
+            self.log_indexes.clear()
+            self.log_search_indexes.clear()
+            self.log_columns.clear()
+            self.log_iteration_stats.clear()
+            for sampler in self.jvm_samplers.values():
+                sampler.stop()
+            self.jvm_samplers.clear()
+            for watcher in self.stats_watchers.values():
+                watcher.stop()
+            self.stats_watchers.clear()
+            self.gc_logs.clear()
+            for recorder in self.java_profilers.values():
+                recorder.cancel()
+        # Let a pending archive finish so the moved-aside log is not left behind
+        self._archiver.shutdown(wait=True)
+        self.registry.close()
+        try:
+            self.docker_client.close()
+        except Exception:
+            pass
+    
+    @classmethod
+    def _get_event_watcher(cls, docker_client):
+        """Return the process-wide Docker events watcher, starting it on first use"""
+        with cls._event_watcher_lock:
+            if cls._event_watcher is None:
+                cls._event_watcher = ContainerEventWatcher(docker_client)
+                cls._event_watcher.start()
+            return cls._event_watcher
     
     def load_process_state(self):
-        """Load persisted state from disk if exists"""
-        if os.path.exists(self.state_file):
-            try:
-                with open(self.state_file, 'r') as f:
-                    return json.load(f)
-            except:
-                return None
-        return None
+        """Return the active run from the run registry, or None"""
+        try:
+            run = self.registry.active_run(self.container_name)
+        except Exception:
+            return None
+        if run is None:
+            return None
+        return {
+            'run_id': run['id'],
+            'pid': run['pid'],
+            'log_file': run['log_file'],
+            'start_time': run['start_time'],
+            'is_running': True,
+            'container_name': run['container_name'],
+            'exec_id': run['exec_id']
+        }
+    
+    def save_process_state(self, pid, log_file, start_time, is_running, container_name=None, exec_id=None,
+                           log_message=None, iterations=None):
+        """Record a started run in the run registry, returning its run ID"""
+        if not is_running:
+            return None
+        return self.registry.start_run(
+            container_name or self.container_name, start_time, log_file,
+            pid=pid, exec_id=exec_id, log_message=log_message, iterations=iterations
+        )
+    
+    def clear_process_state(self, container_name=None, status="finished", exit_code=None, metrics=None):
+        """Mark the container's running run as ended, with its exit code and summary metrics"""
+        try:
+            self.registry.finish_run(container_name or self.container_name, status, exit_code, metrics)
+        except Exception:
+            pass
+    
+    def get_run_metrics(self, log_file):
+        """Summary metrics of a run's log for the run registry"""
+        try:
+            stats = self.get_iteration_stats(log_file)
+        except Exception:
+            return {}
+        if stats.iterations == 0:
+            return {}
+        return {
+            'iterations_logged': stats.iterations,
+            'iterations_per_sec': stats.overall_rate(),
+            'p50_gap_ms': stats.gaps.percentile(50),
+            'p99_gap_ms': stats.gaps.percentile(99),
+            'max_gap_s': stats.max_gap,
+            'stall_count': stats.stall_count
+        }
+    
+    def list_runs(self, limit=50, status=None):
+        """Return recent runs from the run registry, newest first"""
+        try:
+            return self.registry.recent_runs(limit=limit, status=status)
+        except Exception:
+            return []
+    
+    def get_java_exec_id(self, container_name=None):
+        """Return the tracked exec ID of the Java app, recovering it from saved state"""
+        name = container_name or self.container_name
+        exec_id = self.java_exec_ids.get(name)
+        # Only the default container's runs are in the run registry
+        if exec_id is None and name == self.container_name:
+            state = self.load_process_state()
+            if state and state.get('container_name') == name and state.get('exec_id'):
+                exec_id = state['exec_id']
+                self.java_exec_ids[name] = exec_id
+        return exec_id
+    
+    def set_java_exec_id(self, container_name, exec_id):
+        """Track an exec ID recovered from elsewhere (e.g. fleet state) unless one is tracked already"""
+        if exec_id:
+            self.java_exec_ids.setdefault(container_name, exec_id)
     
-    def save_process_state(self, pid, log_file, start_time, is_running, container_name=None):
-        """Save process state to disk"""
-        os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
-        with open(self.state_file, 'w') as f:
-            json.dump({
-                'pid': pid,
-                'log_file': log_file,
-                'start_time': start_time,
-                'is_running': is_running,
-                'container_name': container_name or self.container_name
-            }, f)
-    
-    def clear_process_state(self):
-        """Clear process state"""
-        if os.path.exists(self.state_file):
-            os.remove(self.state_file)
+    def inspect_java_exec(self, container_name=None):
+        """Return exec inspect data (Running, ExitCode, Pid) for the Java app, or None"""
+        name = container_name or self.container_name
+        exec_id = self.get_java_exec_id(name)
+        if exec_id is None:
+            return None
+        if self.event_watcher.is_ready:
+            info = self.event_watcher.get_exec(exec_id)
+            if info is not None:
+                return info
+        try:
+            return self.docker_client.api.exec_inspect(exec_id)
+        except docker.errors.NotFound:
+            # Exec instances do not survive a container restart
+            self.java_exec_ids.pop(name, None)
+            return None
+        except Exception:
+            return None
+    
+    def get_java_exit_code(self, container_name=None):
+        """Return the Java app exit code, or None if unknown or still running"""
+        info = self.inspect_java_exec(container_name)
+        if info is None or info.get('Running'):
+            return None
+        return info.get('ExitCode')
     
     def is_java_process_running(self, container_name=None):
         """Check if Java process is running inside the container"""
+        info = self.inspect_java_exec(container_name)
+        if info is not None:
+            return bool(info.get('Running'))
+        
+        # No tracked exec (e.g. after a restart) - fall back to pgrep
         name = container_name or self.container_name
         try:
             container = self.docker_client.containers.get(name)
@@ -52,6 +257,8 @@ class JavaContainerManager:
     def get_container_status(self, container_name=None):
         """Returns 'running', 'stopped', or None if container doesn't exist"""
         name = container_name or self.container_name
+        if self.event_watcher.is_ready:
+            return self.event_watcher.get_status(name)
         try:
             container = self.docker_client.containers.get(name)
             return container.status
@@ -60,28 +267,117 @@ class JavaContainerManager:
         except Exception:
             return None
     
+    def get_container_statuses(self, names=None, label=MANAGED_LABEL):
+        """Return a name -> status map for many containers using a single list call.
+        
+        Containers that don't exist are reported as None.
+        """
+        if self.event_watcher.is_ready and names is not None:
+            return {name: self.event_watcher.get_status(name) for name in names}
+        
+        statuses = {}
+        try:
+            # Low-level list: one request, no per-container inspect
+            filters = {'label': label} if label else None
+            for summary in self.docker_client.api.containers(all=True, filters=filters):
+                for name in summary.get('Names', []):
+                    statuses[name.lstrip('/')] = summary.get('State')
+        except Exception:
+            pass
+        if names is None:
+            return statuses
+        return {name: statuses.get(name) for name in names}
+    
+    def _fan_out(self, func, names, max_workers):
+        """Run func over names on a bounded thread pool, returning a name -> result map"""
+        names = list(names)
+        if not names:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(names))) as pool:
+            return dict(zip(names, pool.map(func, names)))
+    
+    def are_java_processes_running(self, names, max_workers=16):
+        """Return a name -> bool map of Java liveness, inspecting execs on a bounded pool"""
+        return self._fan_out(self.is_java_process_running, names, max_workers)
+    
+    def get_java_exit_codes(self, names, max_workers=16):
+        """Return a name -> exit code map, inspecting execs on a bounded pool"""
+        return self._fan_out(self.get_java_exit_code, names, max_workers)
+    
+    def was_oom_killed(self, container_name=None):
+        """Check if the container was stopped by the OOM killer (from Docker events)"""
+        return self.event_watcher.was_oom_killed(container_name or self.container_name)
+    
     def is_container_running(self, container_name=None):
         """Check if container is running"""
         return self.get_container_status(container_name) == 'running'
     
-    def build_image(self, java_app_dir, tag="java-dummy-app"):
-        """Build Docker image"""
+    def find_cached_image(self, tag, context_hash):
+        """Return the image for tag if it was built from the same context, else None"""
+        try:
+            image = self.docker_client.images.get(tag)
+        except docker.errors.ImageNotFound:
+            return None
+        except Exception:
+            return None
+        if image.labels.get(CONTEXT_HASH_LABEL) == context_hash:
+            return image
+        return None
+    
+    def build_image_stream(self, java_app_dir, tag="java-dummy-app", force=False):
+        """Build Docker image, yielding parsed step events as the build progresses.
+        
+        Yields {'event': 'context', 'files', 'size'} before sending the context, and
+        the last event is always {'event': 'result', 'success', 'message', 'image_id'}.
+        """
         try:
-            image, build_logs = self.docker_client.images.build(
-                path=java_app_dir,
+            # Only the files the Dockerfile copies are hashed and sent to the daemon
+            files = needed_context_files(java_app_dir)
+            context_hash = hash_context(java_app_dir, files)
+            if not force:
+                image = self.find_cached_image(tag, context_hash)
+                if image is not None:
+                    yield {'event': 'result', 'success': True, 'message': "Image up to date (build skipped)", 'image_id': image.id}
+                    return
+            
+            context = build_context_tar(java_app_dir, files)
+            yield {'event': 'context', 'files': files, 'size': len(context.getbuffer())}
+            
+            chunks = self.docker_client.api.build(
+                fileobj=context,
+                custom_context=True,
+                encoding='gzip',
                 tag=tag,
-                rm=True
+                rm=True,
+                labels={CONTEXT_HASH_LABEL: context_hash},
+                decode=True
             )
-            return True, "Image built successfully"
-        except docker.errors.BuildError as e:
-            return False, f"Build Error: {e}"
+            yield from parse_build_stream(chunks)
+        except docker.errors.APIError as e:
+            yield {'event': 'result', 'success': False, 'message': f"Build Error: {e}", 'image_id': None}
         except Exception as e:
-            return False, f"Unexpected error: {e}"
+            yield {'event': 'result', 'success': False, 'message': f"Unexpected error: {e}", 'image_id': None}
+    
+    def build_image(self, java_app_dir, tag="java-dummy-app", force=False):
+        """Build Docker image, skipping the build if the context is unchanged"""
+        for event in self.build_image_stream(java_app_dir, tag, force):
+            if event['event'] == 'result':
+                return event['success'], event['message']
+        return False, "Build produced no result"
     
-    def get_or_create_container(self, log_message, iterations, host_log_file):
-        """Get existing container or create new one"""
+    def get_or_create_container(self, log_message, iterations, host_log_file, container_name=None, labels=None,
+                                host_gc_dir=None):
+        """Get existing container or create new one.
+        
+        With host_gc_dir, a container created without the GC log mount is
+        recreated, since mounts can't be added to an existing container.
+        """
+        name = container_name or self.container_name
         try:
-            container = self.docker_client.containers.get(self.container_name)
+            container = self.docker_client.containers.get(name)
+            if host_gc_dir and not self.has_gc_log_mount(container):
+                container.remove(force=True)
+                return self._create_container(name, log_message, iterations, host_log_file, labels, host_gc_dir), "recreated"
             if container.status == 'running':
                 return container, "reused"
             elif container.status == 'exited':
@@ -89,31 +385,55 @@ class JavaContainerManager:
                 return container, "started"
         except docker.errors.NotFound:
             # Container doesn't exist, create it
-            container = self.docker_client.containers.run(
-                "java-dummy-app",
-                name=self.container_name,
-                detach=True,
-                environment={
-                    "LOG_MESSAGE": log_message,
-                    "ITERATIONS": str(iterations)
-                },
-                volumes={
-                    host_log_file: {'bind': '/app/app.log', 'mode': 'rw'}
-                }
-            )
-            return container, "created"
+            return self._create_container(name, log_message, iterations, host_log_file, labels, host_gc_dir), "created"
+    
+    def _create_container(self, name, log_message, iterations, host_log_file, labels, host_gc_dir):
+        """Start a new app container with the log file (and GC log directory) mounted"""
+        return self.docker_client.containers.run(
+            "java-dummy-app",
+            name=name,
+            detach=True,
+            labels={MANAGED_LABEL: "true", **(labels or {})},
+            environment={
+                "LOG_MESSAGE": log_message,
+                "ITERATIONS": str(iterations)
+            },
+            volumes={
+                host_log_file: {'bind': '/app/app.log', 'mode': 'rw'},
+                **({host_gc_dir: {'bind': CONTAINER_GC_DIR, 'mode': 'rw'}} if host_gc_dir else {})
+            }
+        )
+    
+    def has_gc_log_mount(self, container):
+        """True if the container was created with the GC log directory mounted"""
+        return any(mount.get('Destination') == CONTAINER_GC_DIR for mount in container.attrs.get('Mounts', []))
     
-    def execute_java_app(self, container, log_message, iterations):
-        """Execute Java app inside the container"""
+    def execute_java_app(self, container, log_message, iterations, gc_logging=False):
+        """Execute Java app inside the container, optionally writing a GC log to the mounted directory"""
+        command = "java -cp /app App"
+        if gc_logging:
+            if not self.has_gc_log_mount(container):
+                return False, f"Container {container.name} has no GC log mount; remove it so it is recreated with one"
+            command = "java " + GC_LOG_OPTION.format(path=f"{CONTAINER_GC_DIR}/{GC_LOG_NAME}") + " -cp /app App"
         try:
-            exec_result = container.exec_run(
-                "java -cp /app App",
-                detach=True,
+            # Use the low-level API so the exec ID is kept for liveness checks
+            exec_id = self.docker_client.api.exec_create(
+                container.id,
+                command,
                 environment={
                     "LOG_MESSAGE": log_message,
                     "ITERATIONS": str(iterations)
                 }
-            )
+            )['Id']
+            self.event_watcher.track_exec(exec_id, container.name)
+            self.docker_client.api.exec_start(exec_id, detach=True)
+            self.java_exec_ids[container.name] = exec_id
+            # exec_die events carry no pid, so look it up once while the exec is fresh
+            try:
+                pid = self.docker_client.api.exec_inspect(exec_id).get('Pid')
+            except Exception:
+                pid = None
+            self.event_watcher.track_exec(exec_id, container.name, pid)
             return True, "Java app started"
         except Exception as e:
             return False, f"Failed to execute: {e}"
@@ -128,24 +448,209 @@ class JavaContainerManager:
         except Exception as e:
             return False, f"Failed to stop: {e}"
     
+    def start_jvm_metrics(self, container_name=None, interval=2.0):
+        """Start (or keep) sampling JVM heap, GC and thread counters in a container"""
+        name = container_name or self.container_name
+        with self._lock:
+            sampler = self.jvm_samplers.get(name)
+            if sampler is None:
+                sampler = self.jvm_samplers[name] = JvmMetricsSampler(self.docker_client, name, interval)
+            sampler.start()
+            return sampler
+    
+    def stop_jvm_metrics(self, container_name=None):
+        """Stop sampling a container; its collected samples stay readable"""
+        sampler = self.get_jvm_metrics(container_name)
+        if sampler is not None:
+            sampler.stop()
+    
+    def get_jvm_metrics(self, container_name=None):
+        """Return the JvmMetricsSampler of a container, or None if never started"""
+        with self._lock:
+            return self.jvm_samplers.get(container_name or self.container_name)
+    
+    def watch_container_stats(self, container_name=None):
+        """Start (or keep) streaming resource stats of a container in the background"""
+        name = container_name or self.container_name
+        with self._lock:
+            watcher = self.stats_watchers.get(name)
+            if watcher is None:
+                watcher = self.stats_watchers[name] = ContainerStatsWatcher(self.docker_client, name)
+            watcher.start()
+            return watcher
+    
+    def stop_container_stats(self, container_name=None):
+        """Stop streaming a container's stats; its collected samples stay readable"""
+        watcher = self.get_container_stats(container_name)
+        if watcher is not None:
+            watcher.stop()
+    
+    def get_container_stats(self, container_name=None):
+        """Return the ContainerStatsWatcher of a container, or None if not watched"""
+        with self._lock:
+            return self.stats_watchers.get(container_name or self.container_name)
+    
+    def _exec_java_command(self, name, command, stream=False):
+        """Run a shell command with $pid set to the App JVM's pid; returns its stdout"""
+        exec_id = self.docker_client.api.exec_create(
+            name, java_shell_command(command), stdout=True, stderr=False
+        )['Id']
+        return self.docker_client.api.exec_start(exec_id, stream=stream)
+    
+    def start_java_profile(self, seconds=30, container_name=None):
+        """Start a Flight Recorder capture of the App JVM in the background.
+        
+        Progress and the resulting JfrProfile are read from get_java_profiler.
+        """
+        name = container_name or self.container_name
+        with self._lock:
+            recorder = self.java_profilers.get(name)
+            if recorder is not None and recorder.is_running:
+                return False, "A profile is already being recorded"
+            recorder = self.java_profilers[name] = JfrRecorder(self.docker_client, name, seconds, self.profile_dir)
+            recorder.start()
+        return True, f"Recording for {seconds}s"
+    
+    def get_java_profiler(self, container_name=None):
+        """Return the latest JfrRecorder of a container (running or finished), or None"""
+        with self._lock:
+            return self.java_profilers.get(container_name or self.container_name)
+    
+    def capture_thread_dump(self, container_name=None):
+        """Save a `jcmd <pid> Thread.print` dump of the App JVM under the active run's directory"""
+        name = container_name or self.container_name
+        try:
+            output = self._exec_java_command(name, "jcmd $pid Thread.print")
+            if b"Full thread dump" not in output:
+                return False, f"Failed to capture thread dump: {output.decode('utf-8', errors='replace').strip() or 'Java process not found'}"
+            state = self.load_process_state()
+            run_dir = os.path.join(self.thread_dump_dir, f"run-{state['run_id']}" if state else "no-run")
+            os.makedirs(run_dir, exist_ok=True)
+            dump_file = os.path.join(run_dir, datetime.now().strftime("%Y%m%d-%H%M%S-%f") + ".txt")
+            with open(dump_file, 'wb') as f:
+                f.write(output)
+            return True, f"Thread dump saved: {os.path.basename(dump_file)}"
+        except Exception as e:
+            return False, f"Failed to capture thread dump: {e}"
+    
+    def list_thread_dump_runs(self):
+        """Return run directory names that hold thread dumps, newest first"""
+        if not os.path.isdir(self.thread_dump_dir):
+            return []
+        runs = [entry for entry in os.scandir(self.thread_dump_dir) if entry.is_dir()]
+        return [entry.name for entry in sorted(runs, key=lambda entry: entry.stat().st_mtime, reverse=True)]
+    
+    def list_thread_dumps(self, run):
+        """Return the dump files of a run directory in capture order"""
+        run_dir = os.path.join(self.thread_dump_dir, run)
+        if not os.path.isdir(run_dir):
+            return []
+        return sorted(os.path.join(run_dir, name) for name in os.listdir(run_dir) if name.endswith(".txt"))
+    
+    def load_thread_dump(self, dump_file):
+        """Parse a saved thread dump"""
+        with open(dump_file, 'r', encoding='utf-8', errors='replace') as f:
+            return ThreadDump(f.read(), captured_at=os.path.basename(dump_file)[:-4])
+    
     def remove_container(self, container_name=None):
         """Remove container"""
         name = container_name or self.container_name
         try:
             container = self.docker_client.containers.get(name)
             container.remove(force=True)
+            with self._lock:
+                watcher = self.stats_watchers.pop(name, None)
+            if watcher is not None:
+                watcher.stop()
             return True, "Container removed"
         except Exception as e:
             return False, f"Failed to remove: {e}"
     
-    def prepare_log_file(self, host_log_file):
-        """Prepare log file for mounting"""
-        # Clear previous log
+    def prepare_log_file(self, host_log_file, archive=True):
+        """Prepare log file for mounting.
+        
+        The previous run's log is archived unless archive is False (fleet
+        members, whose relaunches would otherwise push single-container runs
+        out of the archive).
+        """
+        # Archive the previous run's log before starting a fresh one
+        if archive and os.path.exists(host_log_file) and os.path.getsize(host_log_file) > 0:
+            self.archive_log(host_log_file)
+        
+        # Clear previous log and its line index
         if os.path.exists(host_log_file):
             os.remove(host_log_file)
+        remove_index_files(host_log_file)
         # Create empty file
         open(host_log_file, 'a').close()
     
+    def prepare_gc_log(self, host_gc_dir):
+        """Create the GC log directory and drop the previous run's GC log and parser"""
+        os.makedirs(host_gc_dir, exist_ok=True)
+        gc_log_file = os.path.join(host_gc_dir, GC_LOG_NAME)
+        if os.path.exists(gc_log_file):
+            os.remove(gc_log_file)
+        with self._lock:
+            self.gc_logs.pop(gc_log_file, None)
+        return gc_log_file
+    
+    def get_gc_log(self, gc_log_file, max_bytes=256 * 1024 * 1024):
+        """Return the GcLogParser of a GC log, fed with what was appended since the last call.
+        
+        Parsing holds only that parser's lock, not the manager lock.
+        """
+        with self._lock:
+            entry = self.gc_logs.get(gc_log_file)
+            if entry is None:
+                entry = self.gc_logs[gc_log_file] = (GcLogParser(), threading.Lock())
+        parser, parser_lock = entry
+        with parser_lock:
+            parser.update_from_file(gc_log_file, max_bytes)
+        return parser
+    
+    def archive_log(self, log_file):
+        """Move a finished log aside and compress it into the run archive in the background.
+        
+        Returns a Future of the archived run ID (None if nothing was archived),
+        or None if the log could not be moved aside.
+        """
+        try:
+            run = self.registry.last_finished_run(log_file)
+            pending_root = os.path.join(self.archive_dir, ".pending")
+            os.makedirs(pending_root, exist_ok=True)
+            pending_file = os.path.join(tempfile.mkdtemp(dir=pending_root), os.path.basename(log_file))
+            shutil.move(log_file, pending_file)
+        except Exception:
+            return None
+        return self._archiver.submit(self._archive_pending, pending_file, log_file, run['id'] if run else None)
+    
+    def _archive_pending(self, pending_file, log_file, run_id):
+        """Compress a moved-aside log, link it to its run and apply retention"""
+        try:
+            archive_run_id = archive_log_file(pending_file, self.archive_dir, source=log_file)
+            if archive_run_id is not None and run_id is not None:
+                self.registry.set_archive(run_id, archive_run_id)
+            removed = apply_retention(
+                self.archive_dir,
+                max_runs=self.max_archived_runs,
+                max_bytes=self.max_archive_bytes,
+                max_age_days=self.max_archive_age_days
+            )
+            self.registry.clear_archive(removed)
+            return archive_run_id
+        except Exception:
+            return None
+        finally:
+            shutil.rmtree(os.path.dirname(pending_file), ignore_errors=True)
+    
+    def list_archived_runs(self):
+        """Return metadata of archived runs, newest first"""
+        return list_archive_dir(self.archive_dir)
+    
+    def open_archived_log(self, run_id):
+        """Open an archived run for paging and search without full decompression"""
+        return ArchivedLog(os.path.join(self.archive_dir, run_id))
+    
     def read_logs(self, log_file):
         """Read log file contents"""
         if os.path.exists(log_file):
@@ -154,4 +659,209 @@ class JavaContainerManager:
                     return f.read()
             except:
                 return ""
-        return ""
\ No newline at end of file
+        return ""
+    
+    def open_log_tailer(self, log_file, tail_bytes=None):
+        """Create a tailer that returns only newly appended log content.
+        
+        With tail_bytes, it starts at the last lines within that many bytes of the end.
+        """
+        return LogTailer(log_file, tail_bytes=tail_bytes)
+    
+    def open_mapped_log(self, log_file):
+        """Memory-map a log file and index its lines for paginated reading"""
+        return MappedLog(log_file)
+    
+    def update_log_index(self, log_file):
+        """Extend the line index of a log over newly written lines and persist it.
+        
+        Returns the number of indexed lines.
+        """
+        index = self._refresh_line_index(log_file)
+        self._update_derived_index(self.log_iteration_stats, self.iteration_stats_factory, log_file)
+        # A log the search index hasn't seen yet catches up one slice per update
+        self._get_search_index(log_file, DERIVED_FEED_BYTES)
+        return index.line_count
+    
+    def _refresh_line_index(self, log_file):
+        """Bring the line index of a log up to date and persist it.
+        
+        The log is scanned for new lines outside the manager lock (one scan
+        at a time), so indexing a large log doesn't hold up other sessions;
+        only attaching the new line ends to the shared index takes the lock.
+        """
+        with self._index_lock:
+            with self._lock:
+                index = self.log_indexes.get(log_file)
+            if index is None:
+                # Nobody else can see the index until it is published
+                index = MappedLog(log_file)
+                with self._lock:
+                    self.log_indexes[log_file] = index
+            else:
+                scan = index.scan()
+                with self._lock:
+                    index.apply_scan(scan)
+            try:
+                index.save_index()
+            except OSError:
+                pass
+            return index
+    
+    def _update_derived_index(self, indexes, factory, log_file, max_bytes=None):
+        """Feed complete lines a derived index (search, columns) hasn't seen yet into it.
+        
+        Lines are copied DERIVED_FEED_BYTES at a time under the manager lock
+        and parsed outside it, so catching up on a large log never copies it
+        whole or holds up other sessions. With max_bytes, stops after about
+        that many bytes even if not caught up. Returns the derived index.
+        """
+        fed = 0
+        with self._feed_lock:
+            while True:
+                with self._lock:
+                    index = self.log_indexes[log_file]
+                    derived, generation = indexes.get(log_file, (None, None))
+                    if derived is None or generation != index.generation or derived.line_count > len(index.line_ends):
+                        derived = factory()
+                        indexes[log_file] = (derived, index.generation)
+                    first_line = derived.line_count
+                    if first_line >= len(index.line_ends) or (max_bytes is not None and fed >= max_bytes):
+                        return derived
+                    start = index.line_offset(first_line)
+                    end_line = min(
+                        max(bisect_right(index.line_ends, start + DERIVED_FEED_BYTES), first_line + 1),
+                        len(index.line_ends)
+                    )
+                    with index.line_range_bytes(first_line, end_line) as view:
+                        data = bytes(view)
+                derived.feed(data, first_line)
+                fed += len(data)
+    
+    def get_iteration_stats(self, log_file):
+        """Return the IterationStats of a log, brought up to date"""
+        self.update_log_index(log_file)
+        with self._lock:
+            return self.log_iteration_stats[log_file][0]
+    
+    def get_cached_iteration_stats(self, log_file):
+        """Return the IterationStats of a log as of the last update_log_index, or None"""
+        with self._lock:
+            return self.log_iteration_stats.get(log_file, (None, None))[0]
+    
+    def get_log_columns(self, log_file):
+        """Return the AppLogParser holding the columnar parse of a log, brought up to date.
+        
+        The columns are only built when first asked for, not while tailing.
+        """
+        self._refresh_line_index(log_file)
+        return self._update_derived_index(self.log_columns, AppLogParser, log_file)
+    
+    def _get_search_index(self, log_file, max_bytes=None):
+        """Return the inverted index of a log, fed with up to max_bytes of lines it hasn't seen"""
+        search_index = self._update_derived_index(self.log_search_indexes, LogSearchIndex, log_file, max_bytes)
+        with self._lock:
+            self.log_search_indexes.move_to_end(log_file)
+            while len(self.log_search_indexes) > self.max_search_indexes:
+                self.log_search_indexes.popitem(last=False)
+        return search_index
+    
+    def search_logs(self, log_file, query, regex=False, limit=200):
+        """Search a log (case-insensitive substring, or regex), returning up to limit (line number, text) matches.
+        
+        Substring queries are answered from the inverted index: each word of
+        the query is looked up in the index vocabulary, the postings of the
+        matching tokens are intersected and only those lines are checked for
+        the substring. Regexes, queries without words, words too common to
+        narrow anything and logs the index hasn't caught up with yet are
+        answered by scanning the log. Neither holds the manager lock while
+        reading the log. Raises re.error for an invalid regex.
+        """
+        index = self._refresh_line_index(log_file)
+        needle = query.encode('utf-8').lower()
+        pattern = re.compile(query.encode('utf-8') if regex else re.escape(query.encode('utf-8')), re.IGNORECASE)
+        candidates = None
+        search_index = None if regex else self._get_search_index(log_file, DERIVED_FEED_BYTES)
+        with self._lock:
+            if search_index is not None and search_index.line_count >= len(index.line_ends):
+                candidates = search_index.candidate_lines(query_terms(needle))
+            line_ends, size = index.line_ends, index.size
+        if size == 0:
+            return []
+        
+        def line_bounds(line):
+            return line_ends[line - 1] if line > 0 else 0, line_ends[line] if line < len(line_ends) else size
+        
+        lines = []
+        try:
+            # A private mapping: the shared one may be remapped by other sessions meanwhile
+            with open(log_file, 'rb') as f, mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mapped:
+                if candidates is not None:
+                    for line in candidates:
+                        start, end = line_bounds(line)
+                        text = mapped[start:end]
+                        if needle in text.lower():
+                            lines.append((line, text))
+                            if len(lines) >= limit:
+                                break
+                else:
+                    for match in pattern.finditer(mapped):
+                        line = bisect_right(line_ends, match.start())
+                        if lines and lines[-1][0] == line:
+                            continue
+                        start, end = line_bounds(line)
+                        lines.append((line, mapped[start:end]))
+                        if len(lines) >= limit:
+                            break
+        except (OSError, ValueError):
+            return []
+        return [(line, text.decode('utf-8', errors='replace').rstrip("\n")) for line, text in lines]
+    
+    def get_log_watcher(self, log_file):
+        """Return the running change watcher for a log file, starting it on first use"""
+        with self._lock:
+            watcher = self.log_watchers.get(log_file)
+            if watcher is None:
+                watcher = LogWatcher(log_file)
+                watcher.start()
+                self.log_watchers[log_file] = watcher
+            return watcher
+    
+    def get_log_generation(self, log_file):
+        """Return log_file's change counter without blocking; it moves whenever the file changes"""
+        return self.get_log_watcher(log_file).generation
+    
+    def wait_for_log_change(self, log_file, generation, timeout):
+        """Block until log_file changes after the given generation, or timeout.
+        
+        Returns the new generation to pass to the next call.
+        """
+        return self.get_log_watcher(log_file).wait(generation, timeout)
+    
+    def read_logs_before(self, log_file, end_offset, max_lines=200, max_bytes=64 * 1024):
+        """Read up to max_lines complete lines ending at end_offset.
+        
+        Returns (start_offset, content) so callers can keep paging backwards.
+        """
+        if end_offset <= 0 or not os.path.exists(log_file):
+            return 0, ""
+        try:
+            with open(log_file, 'rb') as f:
+                start = max(0, end_offset - max_bytes)
+                f.seek(start)
+                data = f.read(end_offset - start)
+        except OSError:
+            return end_offset, ""
+        
+        # Drop the partial first line unless we reached the start of the file
+        if start > 0:
+            cut = data.find(b"\n") + 1
+            start += cut
+            data = data[cut:]
+        
+        lines = data.splitlines(keepends=True)
+        if len(lines) > max_lines:
+            skipped = lines[:-max_lines]
+            start += sum(len(line) for line in skipped)
+            lines = lines[-max_lines:]
+        return start, b"".join(lines).decode('utf-8', errors='replace')
\ No newline at end of file
@@ -0,0 +1,131 @@
+from collections import Counter
+
+EXECUTION_SAMPLE = "jdk.ExecutionSample"
+ALLOCATION_SAMPLE = "jdk.ObjectAllocationSample"
+# Events requested from `jfr print` and the stack depth kept per event
+PRINT_EVENTS = f"{EXECUTION_SAMPLE},{ALLOCATION_SAMPLE}"
+STACK_DEPTH = 64
+SIZE_UNITS = {"byte": 1, "bytes": 1, "kb": 1024, "mb": 1024 ** 2, "gb": 1024 ** 3, "tb": 1024 ** 4}
+
+
+def parse_size(text):
+    """Bytes of a `jfr print` size such as "512 bytes" or "1.3 MB", or 0"""
+    parts = text.split()
+    try:
+        return int(float(parts[0]) * SIZE_UNITS.get(parts[1].lower(), 1)) if len(parts) == 2 else int(float(parts[0]))
+    except (ValueError, IndexError):
+        return 0
+
+
+def frame_name(line):
+    """Method of a printed frame without its parameter list and line number"""
+    return line.split("(", 1)[0]
+
+
+class JfrProfile:
+    """Hot-method and allocation-site summary built from `jfr print` text output.
+
+    Fed incrementally with output chunks, it keeps one event at a time and
+    aggregates stacks as frame tuples in Counters, so memory grows with the
+    number of distinct stacks rather than the size of the recording.
+    """
+
+    def __init__(self, recording_file=None, seconds=None):
+        self.recording_file = recording_file
+        self.seconds = seconds
+        self.samples = 0
+        self.stacks = Counter()
+        self.allocated = 0
+        self.allocation_by_class = Counter()
+        self.allocation_by_site = Counter()
+        self._partial = ""
+        self._event = None
+        self._in_stack = False
+
+    def feed(self, text):
+        """Consume a chunk of `jfr print` output (may end mid-line)"""
+        lines = (self._partial + text).split("\n")
+        self._partial = lines.pop()
+        for line in lines:
+            self._feed_line(line)
+
+    def close(self):
+        """Consume any unterminated last line"""
+        if self._partial:
+            self._feed_line(self._partial)
+            self._partial = ""
+
+    def _feed_line(self, line):
+        event = self._event
+        if event is None:
+            if line.endswith("{") and not line.startswith(" "):
+                self._event = {'type': line[:-1].strip(), 'frames': []}
+            return
+
+        stripped = line.strip()
+        if self._in_stack:
+            if stripped == "]":
+                self._in_stack = False
+            elif stripped and stripped != "...":
+                event['frames'].append(frame_name(stripped))
+        elif line == "}":
+            self._finish(event)
+            self._event = None
+        elif stripped.startswith("stackTrace = ["):
+            self._in_stack = not stripped.endswith("]")
+        elif stripped.startswith("objectClass = "):
+            event['class'] = stripped[len("objectClass = "):].split(" (", 1)[0]
+        elif stripped.startswith("weight = "):
+            event['weight'] = parse_size(stripped[len("weight = "):])
+
+    def _finish(self, event):
+        frames = tuple(event['frames'])
+        if event['type'] == EXECUTION_SAMPLE and frames:
+            self.samples += 1
+            self.stacks[frames] += 1
+        elif event['type'] == ALLOCATION_SAMPLE:
+            weight = event.get('weight', 0)
+            self.allocated += weight
+            self.allocation_by_class[event.get('class', "?")] += weight
+            self.allocation_by_site[frames[0] if frames else "?"] += weight
+
+    def hot_methods(self, limit=20):
+        """Return [(method, self samples, total samples)] ordered by self samples"""
+        self_counts = Counter()
+        total_counts = Counter()
+        for frames, count in self.stacks.items():
+            self_counts[frames[0]] += count
+            for method in set(frames):
+                total_counts[method] += count
+        return [(method, count, total_counts[method]) for method, count in self_counts.most_common(limit)]
+
+    def folded_stacks(self):
+        """Stacks in folded format ("root;...;leaf count"), as flame graph tools expect"""
+        return [f"{';'.join(reversed(frames))} {count}" for frames, count in self.stacks.most_common()]
+
+    def flame_graph(self, min_fraction=0.002, max_depth=STACK_DEPTH):
+        """Lay out a flame graph as [{'method', 'depth', 'start', 'end', 'samples'}].
+
+        start and end are fractions of all samples; frames narrower than
+        min_fraction are dropped to keep the chart small.
+        """
+        root = {}
+        for frames, count in self.stacks.items():
+            node = root
+            for method in reversed(frames[-max_depth:]):
+                child = node.setdefault(method, [0, {}])
+                child[0] += count
+                node = child[1]
+
+        rects = []
+        total = float(self.samples) or 1.0
+        pending = [(root, 0, 0.0)]
+        while pending:
+            children, depth, start = pending.pop()
+            for method, (count, grandchildren) in sorted(children.items()):
+                width = count / total
+                if width >= min_fraction:
+                    rects.append({'method': method, 'depth': depth, 'start': start, 'end': start + width, 'samples': count})
+                    pending.append((grandchildren, depth + 1, start))
+                start += width
+        return rects
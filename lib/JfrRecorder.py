@@ -0,0 +1,147 @@
+import os
+import time
+import codecs
+import shutil
+import tarfile
+import tempfile
+import threading
+from datetime import datetime
+from lib.JfrProfile import JfrProfile, PRINT_EVENTS, STACK_DEPTH
+
+# Finds the App JVM from inside a shell exec ("[j]ava" keeps pgrep from matching the shell)
+JAVA_PID_COMMAND = "pgrep -f '[j]ava.*App' | head -n 1"
+RECORDING_NAME = "java-app-monitoring"
+RECORDING_FILE = "/tmp/java-app-monitoring.jfr"
+# stderr kept from `jfr print` for the error message
+MAX_ERROR_BYTES = 4096
+
+
+def java_shell_command(command):
+    """Wrap a shell command so it runs with $pid set to the App JVM's pid (exit 1 if none)"""
+    return ["sh", "-c", f"pid=$({JAVA_PID_COMMAND}); [ -n \"$pid\" ] || exit 1; {command}"]
+
+
+class JfrRecorder:
+    """One Flight Recorder capture of the App JVM, run in a background thread.
+
+    Starts a recording with jcmd, waits `seconds`, stops it to a file,
+    copies the file to profile_dir and streams `jfr print` output into a
+    JfrProfile. The recording is always stopped and the file removed from
+    the container, also when a step fails. state moves through
+    "starting", "recording", "summarizing" and ends as "done" or "failed".
+    """
+
+    def __init__(self, docker_client, container_name, seconds, profile_dir):
+        self.docker_client = docker_client
+        self.container_name = container_name
+        self.seconds = seconds
+        self.profile_dir = profile_dir
+        self.state = "starting"
+        self.message = None
+        self.profile = None
+        self.started_at = None
+        self._cancelled = threading.Event()
+        self._thread = None
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def progress(self):
+        """Fraction of the recording time elapsed (0-1)"""
+        if self.started_at is None:
+            return 0.0
+        return min((time.time() - self.started_at) / self.seconds, 1.0)
+
+    def start(self):
+        """Start the capture in a background thread"""
+        self._thread = threading.Thread(target=self._run, name=f"jfr-recorder:{self.container_name}", daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """End the recording early; the recording is still stopped and cleaned up"""
+        self._cancelled.set()
+
+    def _exec(self, command, **kwargs):
+        api = self.docker_client.api
+        exec_id = api.exec_create(self.container_name, command, stdout=True, stderr=False)['Id']
+        return api.exec_start(exec_id, **kwargs)
+
+    def _run(self):
+        recording = False
+        try:
+            output = self._exec(java_shell_command(
+                f"jcmd $pid JFR.start name={RECORDING_NAME} settings=profile filename={RECORDING_FILE}"
+            ))
+            if b"Started recording" not in output:
+                raise RuntimeError(output.decode('utf-8', errors='replace').strip() or "Java process not found")
+            recording = True
+            self.started_at = time.time()
+            self.state = "recording"
+            self._cancelled.wait(self.seconds)
+
+            self._exec(java_shell_command(f"jcmd $pid JFR.stop name={RECORDING_NAME} filename={RECORDING_FILE}"))
+            recording = False
+            self.state = "summarizing"
+            recording_file = self._copy_recording()
+            self.profile = self._summarize(recording_file)
+            self.state = "done"
+            self.message = f"Profiled for {self.seconds}s: {self.profile.samples} execution samples"
+        except Exception as e:
+            self.state = "failed"
+            self.message = f"Failed to profile: {e}"
+        finally:
+            # Never leave the recording running or its file behind in the container
+            if recording:
+                try:
+                    self._exec(java_shell_command(f"jcmd $pid JFR.stop name={RECORDING_NAME}"))
+                except Exception:
+                    pass
+            try:
+                self._exec(["rm", "-f", RECORDING_FILE])
+            except Exception:
+                pass
+
+    def _copy_recording(self):
+        """Copy the recording (a tar stream) to profile_dir so it can be opened in JMC later"""
+        os.makedirs(self.profile_dir, exist_ok=True)
+        recording_file = os.path.join(
+            self.profile_dir, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{self.container_name}.jfr"
+        )
+        chunks, _ = self.docker_client.api.get_archive(self.container_name, RECORDING_FILE)
+        with tempfile.TemporaryFile() as archive:
+            for chunk in chunks:
+                archive.write(chunk)
+            archive.seek(0)
+            with tarfile.open(fileobj=archive, mode='r|') as tar:
+                for member in tar:
+                    with tar.extractfile(member) as source, open(recording_file, 'wb') as target:
+                        shutil.copyfileobj(source, target)
+                    break
+        return recording_file
+
+    def _summarize(self, recording_file):
+        """Stream `jfr print` output from the container into a JfrProfile, failing on a non-zero exit"""
+        api = self.docker_client.api
+        profile = JfrProfile(recording_file, self.seconds)
+        exec_id = api.exec_create(
+            self.container_name,
+            ["jfr", "print", "--stack-depth", str(STACK_DEPTH), "--events", PRINT_EVENTS, RECORDING_FILE],
+            stdout=True, stderr=True
+        )['Id']
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        errors = b""
+        for stdout, stderr in api.exec_start(exec_id, stream=True, demux=True):
+            if stdout:
+                profile.feed(decoder.decode(stdout))
+            if stderr and len(errors) < MAX_ERROR_BYTES:
+                errors += stderr
+        profile.feed(decoder.decode(b"", final=True))
+        profile.close()
+
+        exit_code = api.exec_inspect(exec_id).get('ExitCode')
+        if exit_code != 0:
+            detail = errors.decode('utf-8', errors='replace').strip()[:MAX_ERROR_BYTES]
+            raise RuntimeError(f"jfr print exited with code {exit_code}: {detail or 'no output'}")
+        return profile
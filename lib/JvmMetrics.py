@@ -0,0 +1,154 @@
+import re
+import time
+import struct
+import threading
+from lib.TimeSeriesRing import TimeSeriesRing
+from lib.JfrRecorder import java_shell_command
+
+# One exec per sample: print the App JVM's pid, then its hsperfdata file (the
+# shared memory counters jstat reads)
+SAMPLE_COMMAND = java_shell_command("echo $pid; cat /tmp/hsperfdata_*/$pid")
+PERFDATA_MAGIC = 0xcafec0c0
+# Prologue: magic (always big-endian), byte order, major, minor, accessible,
+# used, overflow, mod time stamp, entry offset, entry count
+PROLOGUE_FORMAT = "IBBBBiiqii"
+# Entry: length, name offset, vector length, type, flags, units, variability, data offset
+ENTRY_FORMAT = "iiiBBBBi"
+MIB = 1024.0 * 1024.0
+
+JVM_COLUMNS = (
+    "heap_used_mb", "heap_committed_mb", "heap_max_mb", "metaspace_used_mb",
+    "young_gc_count", "young_gc_time_ms", "old_gc_count", "old_gc_time_ms",
+    "threads_live", "threads_daemon", "uptime_s"
+)
+_SPACE_USED = re.compile(r"sun\.gc\.generation\.\d+\.space\.\d+\.used$")
+_GENERATION_CAPACITY = re.compile(r"sun\.gc\.generation\.\d+\.capacity$")
+_GENERATION_MAX = re.compile(r"sun\.gc\.generation\.\d+\.maxCapacity$")
+
+
+def parse_perfdata(data):
+    """Parse a HotSpot hsperfdata (v2) buffer into {counter name: int or str}"""
+    magic, byte_order, major = struct.unpack_from(">IBB", data, 0)
+    if magic != PERFDATA_MAGIC or major != 2:
+        raise ValueError("Not a version 2 hsperfdata buffer")
+    endian = "<" if byte_order == 1 else ">"
+    entry = struct.Struct(endian + ENTRY_FORMAT)
+    long_value = struct.Struct(endian + "q")
+    _, _, _, _, _, used, _, _, entry_offset, num_entries = struct.unpack_from(endian + PROLOGUE_FORMAT, data, 0)
+
+    counters = {}
+    offset = entry_offset
+    end = min(used, len(data))
+    for _ in range(num_entries):
+        if offset + entry.size > end:
+            break
+        entry_length, name_offset, vector_length, data_type, _, _, _, data_offset = entry.unpack_from(data, offset)
+        if entry_length <= 0 or offset + entry_length > end:
+            break
+        name_start = offset + name_offset
+        name = data[name_start:data.index(b"\0", name_start)].decode('ascii', errors='replace')
+        value_start = offset + data_offset
+        if vector_length == 0 and data_type == ord('J'):
+            counters[name] = long_value.unpack_from(data, value_start)[0]
+        elif vector_length > 0 and data_type == ord('B'):
+            raw = data[value_start:value_start + vector_length]
+            counters[name] = raw.split(b"\0", 1)[0].decode('utf-8', errors='replace')
+        offset += entry_length
+    return counters
+
+
+def jvm_metrics(counters):
+    """Reduce raw perf counters to the JVM_COLUMNS values (missing counters are left out)"""
+    frequency = counters.get("sun.os.hrt.frequency") or 1
+    metrics = {
+        "heap_used_mb": sum(v for k, v in counters.items() if _SPACE_USED.match(k)) / MIB,
+        "heap_committed_mb": sum(v for k, v in counters.items() if _GENERATION_CAPACITY.match(k)) / MIB,
+        "heap_max_mb": sum(v for k, v in counters.items() if _GENERATION_MAX.match(k)) / MIB,
+    }
+    named = {
+        "metaspace_used_mb": ("sun.gc.metaspace.used", MIB),
+        "young_gc_count": ("sun.gc.collector.0.invocations", 1),
+        "young_gc_time_ms": ("sun.gc.collector.0.time", frequency / 1000.0),
+        "old_gc_count": ("sun.gc.collector.1.invocations", 1),
+        "old_gc_time_ms": ("sun.gc.collector.1.time", frequency / 1000.0),
+        "threads_live": ("java.threads.live", 1),
+        "threads_daemon": ("java.threads.daemon", 1),
+        "uptime_s": ("sun.os.hrt.ticks", frequency),
+    }
+    for column, (counter, divisor) in named.items():
+        if counter in counters:
+            metrics[column] = counters[counter] / divisor
+    return metrics
+
+
+class JvmMetricsSampler:
+    """Background sampler of the App JVM's heap, GC and thread counters in one container.
+
+    Every interval it runs a single exec that dumps the JVM's hsperfdata,
+    parses it on the host and appends one row to a TimeSeriesRing. Samples
+    from a previous JVM are dropped when the pid changes. Sampling stops on
+    its own after max_misses failed samples in a row (JVM gone, nobody
+    left to stop it); start() resumes it.
+    """
+
+    def __init__(self, docker_client, container_name, interval=2.0, capacity=1800, max_misses=5):
+        self.docker_client = docker_client
+        self.container_name = container_name
+        self.interval = interval
+        self.ring = TimeSeriesRing(JVM_COLUMNS, capacity)
+        self.pid = None
+        self.last_error = None
+        self.max_misses = max_misses
+        self.misses = 0
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start sampling in a background thread"""
+        if self.is_running:
+            return
+        self._stopped.clear()
+        self.misses = 0
+        self._thread = threading.Thread(target=self._run, name=f"jvm-metrics:{self.container_name}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling; collected samples are kept"""
+        self._stopped.set()
+
+    def sample(self):
+        """Take one sample now; returns True if a row was recorded"""
+        api = self.docker_client.api
+        try:
+            exec_id = api.exec_create(self.container_name, SAMPLE_COMMAND, stdout=True, stderr=False)['Id']
+            output = api.exec_start(exec_id)
+            pid_line, _, data = output.partition(b"\n")
+            if not data:
+                self.last_error = "Java process or its perf data not found"
+                return False
+            pid = int(pid_line)
+            if pid != self.pid:
+                self.ring.clear()
+                self.pid = pid
+            self.ring.append(time.time(), jvm_metrics(parse_perfdata(data)))
+            self.last_error = None
+            return True
+        except Exception as e:
+            self.last_error = str(e)
+            return False
+
+    def _run(self):
+        while not self._stopped.is_set():
+            started = time.monotonic()
+            if self.sample():
+                self.misses = 0
+            else:
+                self.misses += 1
+                if self.misses >= self.max_misses:
+                    self.last_error = f"Sampling stopped: {self.last_error}"
+                    return
+            self._stopped.wait(max(0.0, self.interval - (time.monotonic() - started)))
@@ -0,0 +1,209 @@
+import os
+import json
+import time
+import zlib
+import shutil
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from lib.MappedLog import MappedLog, INDEX_SUFFIX, TIME_INDEX_SUFFIX, parse_line_timestamp, read_index_file
+
+ARCHIVE_LOG = "log.gz"
+ARCHIVE_META = "meta.json"
+# Uncompressed size of each independently compressed gzip member
+BLOCK_SIZE = 1024 * 1024
+
+
+def archive_log(log_file, archive_dir, block_size=BLOCK_SIZE, source=None):
+    """Compress a finished log into a new run directory under archive_dir.
+
+    The log is written as a sequence of gzip members of about block_size
+    uncompressed bytes, each ending on a line boundary, so any block can be
+    decompressed on its own. The block table and the line index are stored
+    alongside. source is the path recorded (and used in the run ID) when
+    log_file was moved aside first. Returns the run ID, or None if the log
+    is empty.
+    """
+    mapped = MappedLog(log_file)
+    try:
+        if mapped.size == 0:
+            return None
+
+        stamp = datetime.fromtimestamp(os.path.getmtime(log_file)).strftime("%Y%m%d-%H%M%S")
+        name = os.path.splitext(os.path.basename(source or log_file))[0]
+        run_id = f"{stamp}-{name}"
+        suffix = 1
+        while os.path.exists(os.path.join(archive_dir, run_id)):
+            suffix += 1
+            run_id = f"{stamp}-{name}-{suffix}"
+        run_dir = os.path.join(archive_dir, run_id)
+        tmp_dir = run_dir + ".tmp"
+        os.makedirs(tmp_dir, exist_ok=True)
+
+        blocks = []
+        with open(os.path.join(tmp_dir, ARCHIVE_LOG), 'wb') as out:
+            line = 0
+            while line < mapped.line_count:
+                # Cut after the last full line within block_size (at least one line)
+                start = mapped.line_offset(line)
+                end_line = min(max(bisect_right(mapped.line_ends, start + block_size), line + 1), mapped.line_count)
+                compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+                with mapped.line_range_bytes(line, end_line) as view:
+                    member = compressor.compress(view) + compressor.flush()
+                blocks.append([start, out.tell(), len(member)])
+                out.write(member)
+                line = end_line
+
+        mapped.save_index()
+        for suffix_name in (INDEX_SUFFIX, TIME_INDEX_SUFFIX):
+            shutil.copyfile(log_file + suffix_name, os.path.join(tmp_dir, "log" + suffix_name))
+        with open(os.path.join(tmp_dir, ARCHIVE_META), 'w') as f:
+            json.dump({
+                'run_id': run_id,
+                'source': source or log_file,
+                'archived_at': time.time(),
+                'size': mapped.size,
+                'lines': mapped.line_count,
+                'blocks': blocks
+            }, f)
+        os.replace(tmp_dir, run_dir)
+        return run_id
+    finally:
+        mapped.close()
+
+
+def list_archived_runs(archive_dir):
+    """Return metadata of all archived runs, newest first"""
+    runs = []
+    if not os.path.isdir(archive_dir):
+        return runs
+    for run_id in os.listdir(archive_dir):
+        meta_file = os.path.join(archive_dir, run_id, ARCHIVE_META)
+        if not os.path.exists(meta_file):
+            continue
+        try:
+            with open(meta_file, 'r') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            continue
+        meta['compressed_size'] = _dir_size(os.path.join(archive_dir, run_id))
+        runs.append(meta)
+    runs.sort(key=lambda meta: meta['archived_at'], reverse=True)
+    return runs
+
+
+def apply_retention(archive_dir, max_runs=None, max_bytes=None, max_age_days=None):
+    """Delete the oldest archived runs until count, total size and age limits hold.
+
+    Returns the IDs of the removed runs.
+    """
+    runs = list_archived_runs(archive_dir)
+    removed = []
+    total = sum(run['compressed_size'] for run in runs)
+    cutoff = time.time() - max_age_days * 86400 if max_age_days is not None else None
+    # Walk from the oldest run; keep removing while any limit is exceeded
+    for index in range(len(runs) - 1, -1, -1):
+        run = runs[index]
+        too_many = max_runs is not None and index + 1 > max_runs
+        too_big = max_bytes is not None and total > max_bytes
+        too_old = cutoff is not None and run['archived_at'] < cutoff
+        if not (too_many or too_big or too_old):
+            continue
+        shutil.rmtree(os.path.join(archive_dir, run['run_id']), ignore_errors=True)
+        total -= run['compressed_size']
+        removed.append(run['run_id'])
+    return removed
+
+
+def _dir_size(path):
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+
+class ArchivedLog:
+    """Random access to an archived run: only the gzip blocks touched are decompressed"""
+
+    def __init__(self, run_dir):
+        self.run_dir = run_dir
+        with open(os.path.join(run_dir, ARCHIVE_META), 'r') as f:
+            self.meta = json.load(f)
+        self.size = self.meta['size']
+        self.block_starts = [block[0] for block in self.meta['blocks']]
+        _, self.line_ends = read_index_file(os.path.join(run_dir, "log" + INDEX_SUFFIX), 'Q')
+        self.time_lines = array('q')
+        self.time_values = array('q')
+        time_index = os.path.join(run_dir, "log" + TIME_INDEX_SUFFIX)
+        if os.path.exists(time_index):
+            _, samples = read_index_file(time_index, 'q')
+            samples = samples[:len(samples) // 2 * 2]
+            self.time_lines = samples[0::2]
+            self.time_values = samples[1::2]
+
+    @property
+    def line_count(self):
+        """Number of lines, counting a trailing line without a newline"""
+        last_end = self.line_ends[-1] if self.line_ends else 0
+        return len(self.line_ends) + (1 if self.size > last_end else 0)
+
+    def line_offset(self, line):
+        """Uncompressed byte offset where the given 0-based line starts"""
+        if line <= 0:
+            return 0
+        if line > len(self.line_ends):
+            return self.size
+        return self.line_ends[line - 1]
+
+    def _read_block(self, f, block_index):
+        _, compressed_offset, compressed_length = self.meta['blocks'][block_index]
+        f.seek(compressed_offset)
+        return zlib.decompress(f.read(compressed_length), 31)
+
+    def read_bytes(self, start, end):
+        """Uncompressed bytes [start, end), decompressing only the blocks they span"""
+        if end <= start:
+            return b""
+        first = bisect_right(self.block_starts, start) - 1
+        parts = []
+        with open(os.path.join(self.run_dir, ARCHIVE_LOG), 'rb') as f:
+            block = first
+            while block < len(self.block_starts) and self.block_starts[block] < end:
+                data = self._read_block(f, block)
+                base = self.block_starts[block]
+                parts.append(data[max(start - base, 0):end - base])
+                block += 1
+        return b"".join(parts)
+
+    def get_lines(self, start, end):
+        """Decoded text of lines [start, end)"""
+        end = min(end, self.line_count)
+        return self.read_bytes(self.line_offset(start), self.line_offset(end)).decode('utf-8', errors='replace')
+
+    def find_line_at_time(self, timestamp):
+        """Return the first line logged at or after epoch seconds timestamp.
+
+        Binary-searches the sampled timestamps, then decompresses only the
+        lines up to the next sample to find the exact line.
+        """
+        sample = bisect_left(self.time_values, timestamp) - 1
+        line = self.time_lines[sample] if sample >= 0 else 0
+        end = self.time_lines[sample + 1] if sample + 1 < len(self.time_lines) else self.line_count
+        for text in self.read_bytes(self.line_offset(line), self.line_offset(end)).splitlines():
+            value = parse_line_timestamp(text)
+            if value is not None and value >= timestamp:
+                return line
+            line += 1
+        return min(end, max(self.line_count - 1, 0))
+
+    def search(self, pattern, limit=None):
+        """Scan the archive block by block with a compiled bytes regex, returning line numbers"""
+        lines = []
+        with open(os.path.join(self.run_dir, ARCHIVE_LOG), 'rb') as f:
+            for block, base in enumerate(self.block_starts):
+                # Blocks end on line boundaries, so no match spans two blocks
+                for match in pattern.finditer(self._read_block(f, block)):
+                    line = bisect_right(self.line_ends, base + match.start())
+                    if lines and lines[-1] == line:
+                        continue
+                    lines.append(line)
+                    if limit is not None and len(lines) >= limit:
+                        return lines
+        return lines
@@ -0,0 +1,50 @@
+from collections import deque
+
+
+class LogBuffer:
+    """Bounded window over the most recent log lines (last N lines / last M bytes)"""
+
+    def __init__(self, max_lines=500, max_bytes=64 * 1024):
+        self.max_lines = max_lines
+        self.max_bytes = max_bytes
+        self._lines = deque()
+        self._size = 0
+
+    def clear(self):
+        """Drop all buffered lines"""
+        self._lines.clear()
+        self._size = 0
+
+    def append(self, data, start_offset):
+        """Add complete lines (raw bytes) that start at byte offset start_offset in the file"""
+        lines = data.split(b"\n")
+        # data ends with a newline, so the last element is empty
+        lines.pop()
+        # Lines that would be evicted straight away are skipped without decoding
+        first, kept = len(lines), 0
+        while first > 0 and len(lines) - first < self.max_lines and kept + len(lines[first - 1]) + 1 <= self.max_bytes:
+            first -= 1
+            kept += len(lines[first]) + 1
+        offset = start_offset + len(data) - kept
+        for line in lines[first:]:
+            size = len(line) + 1
+            self._lines.append((offset, size, (line + b"\n").decode('utf-8', errors='replace')))
+            self._size += size
+            offset += size
+
+        # Evict from the oldest end until both limits hold
+        while self._lines and (len(self._lines) > self.max_lines or self._size > self.max_bytes):
+            _, size, _ = self._lines.popleft()
+            self._size -= size
+
+    @property
+    def first_offset(self):
+        """Byte offset of the oldest buffered line, or None when empty"""
+        return self._lines[0][0] if self._lines else None
+
+    def __len__(self):
+        return len(self._lines)
+
+    def text(self):
+        """Return the buffered window as a single string"""
+        return "".join(line for _, _, line in self._lines)
@@ -0,0 +1,106 @@
+import re
+from array import array
+from bisect import bisect_left
+from heapq import merge
+
+TOKEN_PATTERN = re.compile(rb"[0-9a-z_]+")
+# Vocabulary tokens one query word may stand for before the index stops narrowing
+MAX_EXPANSIONS = 256
+
+
+def tokenize(text):
+    """Lower-cased word tokens of a bytes line or query"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def query_terms(query):
+    """Split a lower-cased bytes query into (word, prefix, suffix) terms.
+
+    A line containing the query holds, for each word, a token that starts
+    with it when prefix (a non-word character precedes the word in the
+    query), ends with it when suffix (one follows it), equals it when both,
+    and otherwise merely contains it ("1" in "Loop 10").
+    """
+    return [(match.group(), match.start() > 0, match.end() < len(query)) for match in TOKEN_PATTERN.finditer(query)]
+
+
+class LogSearchIndex:
+    """Incremental inverted index of a log: token -> sorted line numbers.
+
+    The vocabulary is also kept as one newline-separated bytes buffer, so
+    the tokens containing a query word are found with a few C-level finds
+    instead of a loop over every token.
+    """
+
+    def __init__(self):
+        self.postings = {}
+        self.line_count = 0
+        self.vocabulary = bytearray(b"\n")
+
+    def feed(self, data, first_line):
+        """Index complete lines (bytes, newline separated) starting at line first_line"""
+        postings = self.postings
+        line = first_line
+        # Split on "\n" only, exactly like the line index
+        lines = data.split(b"\n")
+        if lines[-1] == b"":
+            lines.pop()
+        for text in lines:
+            for token in set(TOKEN_PATTERN.findall(text.lower())):
+                posting = postings.get(token)
+                if posting is None:
+                    posting = postings[token] = array('I')
+                    self.vocabulary += token + b"\n"
+                posting.append(line)
+            line += 1
+        self.line_count = line
+
+    def expand(self, term, limit=MAX_EXPANSIONS):
+        """Return the vocabulary tokens matching a query term, or None if more than limit do"""
+        word, prefix, suffix = term
+        if prefix and suffix:
+            return [word] if word in self.postings else []
+        vocabulary = self.vocabulary
+        pattern = (b"\n" if prefix else b"") + word + (b"\n" if suffix else b"")
+        tokens = []
+        pos = vocabulary.find(pattern)
+        while pos >= 0:
+            word_pos = pos + 1 if prefix else pos
+            start = vocabulary.rfind(b"\n", 0, word_pos) + 1
+            end = vocabulary.find(b"\n", word_pos + len(word))
+            tokens.append(bytes(vocabulary[start:end]))
+            if len(tokens) > limit:
+                return None
+            pos = vocabulary.find(pattern, end)
+        return tokens
+
+    def candidate_lines(self, terms):
+        """Iterate, in order, the lines holding a matching token for every term.
+
+        Returns None when the index can't narrow the query: no terms, or a
+        term matching more than MAX_EXPANSIONS tokens.
+        """
+        groups = []
+        for term in terms:
+            tokens = self.expand(term)
+            if tokens is None:
+                return None
+            groups.append([self.postings[token] for token in tokens])
+        if not groups:
+            return None
+        # Walk the rarest term's lines and probe the others by binary search
+        groups.sort(key=lambda postings: sum(len(posting) for posting in postings))
+        return _candidates(groups[0], groups[1:])
+
+
+def _candidates(driver, others):
+    previous = None
+    for line in merge(*driver):
+        if line != previous and all(any(_contains(posting, line) for posting in group) for group in others):
+            yield line
+        previous = line
+
+
+def _contains(posting, line):
+    index = bisect_left(posting, line)
+    return index < len(posting) and posting[index] == line
@@ -0,0 +1,80 @@
+import os
+
+
+# Most bytes read per call, so catching up on a large backlog is spread over calls
+READ_MAX_BYTES = 1024 * 1024
+
+
+class LogTailer:
+    """Follow a log file and return only the bytes appended since the last read"""
+
+    def __init__(self, log_file, max_bytes=READ_MAX_BYTES, tail_bytes=None):
+        self.log_file = log_file
+        self.max_bytes = max_bytes
+        # When set, the first read starts at the first line within tail_bytes of the end
+        self.tail_bytes = tail_bytes
+        self.offset = 0
+        self.inode = None
+        self.restarted = False
+        self.chunk_offset = 0
+        self._partial = b""
+
+    def reset(self):
+        """Forget the current position and start again from the beginning"""
+        self.offset = 0
+        self.inode = None
+        self._partial = b""
+
+    def read_new(self):
+        """Return newly appended complete lines since the previous call, as raw bytes.
+
+        Reads at most max_bytes per call; the rest is returned by later calls.
+        """
+        self.restarted = False
+        try:
+            stat = os.stat(self.log_file)
+        except OSError:
+            return b""
+
+        # File was replaced (new inode) or truncated - start over
+        if stat.st_ino != self.inode or stat.st_size < self.offset:
+            first_read = self.inode is None
+            if not first_read:
+                self.restarted = True
+            self.reset()
+            self.inode = stat.st_ino
+            if first_read and self.tail_bytes is not None:
+                self.offset = self._tail_start(stat.st_size)
+
+        self.chunk_offset = self.offset - len(self._partial)
+        if stat.st_size == self.offset:
+            return b""
+
+        try:
+            with open(self.log_file, 'rb') as f:
+                f.seek(self.offset)
+                data = f.read(min(stat.st_size - self.offset, self.max_bytes))
+        except OSError:
+            return b""
+        self.offset += len(data)
+
+        # Only hand out complete lines, keep the trailing fragment for next time
+        data = self._partial + data
+        cut = data.rfind(b"\n") + 1
+        self._partial = data[cut:]
+        return data[:cut]
+
+    def _tail_start(self, size):
+        """Offset of the first line starting within tail_bytes of the end of the file"""
+        start = size - self.tail_bytes
+        if start <= 0:
+            return 0
+        try:
+            with open(self.log_file, 'rb') as f:
+                f.seek(start - 1)
+                data = f.read(self.tail_bytes + 1)
+        except OSError:
+            return 0
+        newline = data.find(b"\n")
+        # No line starts in the window: begin at the end and show only new lines
+        return start + newline if newline >= 0 else size
@@ -0,0 +1,132 @@
+import os
+import select
+import struct
+import threading
+import ctypes
+import ctypes.util
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_MOVE_SELF = 0x00000800
+IN_DELETE_SELF = 0x00000400
+IN_IGNORED = 0x00008000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_MOVE_SELF | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def _load_inotify():
+    """Return libc if it provides inotify (Linux), else None"""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+_libc = _load_inotify()
+
+
+class LogWatcher:
+    """Wake waiting tailers when a log file changes.
+
+    Uses inotify (IN_MODIFY / IN_MOVE_SELF / IN_DELETE_SELF) where available and
+    falls back to polling the file's inode, size and mtime every poll_interval.
+    """
+
+    def __init__(self, log_file, poll_interval=0.5):
+        self.log_file = log_file
+        self.poll_interval = poll_interval
+        self.generation = 0
+        self.uses_inotify = False
+        self._changed = threading.Condition()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start watching in a background thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name=f"log-watcher:{self.log_file}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop watching; the thread exits within one poll interval"""
+        self._stopped.set()
+        self._notify()
+
+    def wait(self, generation, timeout):
+        """Block until the generation moves past the one given or timeout passes.
+
+        Returns the current generation.
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: self.generation != generation or self._stopped.is_set(), timeout)
+            return self.generation
+
+    def _notify(self):
+        with self._changed:
+            self.generation += 1
+            self._changed.notify_all()
+
+    def _run(self):
+        fd = _libc.inotify_init1(IN_CLOEXEC) if _libc is not None else -1
+        if fd < 0:
+            self._poll_loop()
+            return
+        self.uses_inotify = True
+        try:
+            self._inotify_loop(fd)
+        finally:
+            os.close(fd)
+
+    def _add_watch(self, fd):
+        return _libc.inotify_add_watch(fd, os.fsencode(self.log_file), WATCH_MASK)
+
+    def _inotify_loop(self, fd):
+        wd = self._add_watch(fd)
+        while not self._stopped.is_set():
+            # The file may not exist yet or may have been replaced - re-arm the watch
+            if wd < 0:
+                wd = self._add_watch(fd)
+                if wd >= 0:
+                    self._notify()
+            ready, _, _ = select.select([fd], [], [], self.poll_interval)
+            if not ready:
+                continue
+
+            data = os.read(fd, 64 * 1024)
+            changed = False
+            offset = 0
+            while offset + EVENT_HEADER.size <= len(data):
+                event_wd, mask, _, name_len = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size + name_len
+                if event_wd != wd:
+                    continue
+                changed = True
+                if mask & IN_MOVE_SELF:
+                    # Stop following the old inode once the path points elsewhere
+                    _libc.inotify_rm_watch(fd, wd)
+                if mask & (IN_MOVE_SELF | IN_DELETE_SELF | IN_IGNORED):
+                    wd = -1
+            if changed:
+                self._notify()
+
+    def _poll_loop(self):
+        last = self._signature()
+        while not self._stopped.wait(self.poll_interval):
+            current = self._signature()
+            if current != last:
+                last = current
+                self._notify()
+
+    def _signature(self):
+        try:
+            stat = os.stat(self.log_file)
+            return stat.st_ino, stat.st_size, stat.st_mtime_ns
+        except OSError:
+            return None
@@ -0,0 +1,302 @@
+import os
+import mmap
+import zlib
+import struct
+import numpy as np
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+# Sidecar files next to the log: uint64 line-end offsets, and (line, epoch) samples
+INDEX_SUFFIX = ".idx"
+TIME_INDEX_SUFFIX = ".tidx"
+# Both sidecars start with: magic, log inode, bytes indexed, crc32 of the indexed tail
+INDEX_HEADER = struct.Struct("<8sQQI4x")
+INDEX_MAGIC = b"MLOGIDX1"
+# Bytes before the end of the last indexed line covered by the crc
+INDEX_TAIL_BYTES = 4096
+# Bytes read at a time when scanning for line ends
+SCAN_CHUNK_BYTES = 16 * 1024 * 1024
+
+
+def parse_line_timestamp(line):
+    """Return the epoch seconds of a '[yyyy-MM-dd HH:mm:ss] ...' line, or None"""
+    if len(line) < 21 or line[0:1] != b"[" or line[20:21] != b"]":
+        return None
+    try:
+        return int(datetime.strptime(bytes(line[1:20]).decode('ascii'), "%Y-%m-%d %H:%M:%S").timestamp())
+    except ValueError:
+        return None
+
+
+def remove_index_files(log_file):
+    """Delete the sidecar index files of a log, if any"""
+    for suffix in (INDEX_SUFFIX, TIME_INDEX_SUFFIX):
+        if os.path.exists(log_file + suffix):
+            os.remove(log_file + suffix)
+
+
+def read_index_file(path, typecode):
+    """Return (header, values) of a sidecar index file.
+
+    header is (inode, indexed bytes, tail crc32); a trailing partial entry
+    left by an interrupted write is dropped. Raises ValueError if the file
+    has no valid header.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < INDEX_HEADER.size:
+        raise ValueError(f"{path} has no index header")
+    magic, inode, size, crc = INDEX_HEADER.unpack_from(data)
+    if magic != INDEX_MAGIC:
+        raise ValueError(f"{path} is not a log index")
+    values = array(typecode)
+    body = data[INDEX_HEADER.size:]
+    values.frombytes(body[:len(body) - len(body) % values.itemsize])
+    return (inode, size, crc), values
+
+
+class MappedLog:
+    """Memory-mapped view of a log file with a line-offset index.
+
+    The index holds the end offset of every complete line (uint64), built once
+    and extended incrementally by refresh(). Line ranges are served straight
+    from the mapping, so memory use doesn't depend on the log size.
+
+    Every sample_every-th line's timestamp is sampled for jump-to-time, and
+    both arrays can be persisted to sidecar files with save_index() so the
+    next reader starts from the stored index instead of rescanning the log.
+    The sidecars are only adopted if their header still matches the log.
+    """
+
+    def __init__(self, log_file, sample_every=1000, load_index=True):
+        self.log_file = log_file
+        self.sample_every = sample_every
+        self.line_ends = array('Q')
+        self.time_lines = array('q')
+        self.time_values = array('q')
+        self.size = 0
+        self.inode = None
+        # Bumped whenever the index is thrown away, so derived indexes can rebuild
+        self.generation = 0
+        self._file = None
+        self._map = None
+        self._saved_lines = 0
+        self._saved_times = 0
+        self._rewrite_index = True
+        if load_index:
+            self._load_index()
+        self.refresh()
+
+    def close(self):
+        """Release the mapping and the file handle"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _reset(self, inode):
+        self.close()
+        self.line_ends = array('Q')
+        self.time_lines = array('q')
+        self.time_values = array('q')
+        self.size = 0
+        self.inode = inode
+        self.generation += 1
+        self._saved_lines = 0
+        self._saved_times = 0
+        self._rewrite_index = True
+
+    def _load_index(self):
+        """Adopt the sidecar index if it still matches the log file"""
+        try:
+            stat = os.stat(self.log_file)
+            header, line_ends = read_index_file(self.log_file + INDEX_SUFFIX, 'Q')
+            time_header, samples = read_index_file(self.log_file + TIME_INDEX_SUFFIX, 'q')
+        except (OSError, ValueError):
+            return
+        inode, size, crc = header
+        # Both sidecars are written together; the log must be the same file, not shorter,
+        # and still hold the same bytes before the end of the last indexed line
+        if time_header != header or inode != stat.st_ino or not line_ends or line_ends[-1] != size:
+            return
+        if size > stat.st_size:
+            return
+        tail_start = max(0, size - INDEX_TAIL_BYTES)
+        with open(self.log_file, 'rb') as f:
+            f.seek(tail_start)
+            if zlib.crc32(f.read(size - tail_start)) != crc:
+                return
+
+        # (line, epoch) pairs: drop an unpaired value and samples past the indexed lines
+        samples = samples[:len(samples) // 2 * 2]
+        time_lines = samples[0::2]
+        kept = bisect_left(time_lines, len(line_ends))
+        self.line_ends = line_ends
+        self.time_lines = time_lines[:kept]
+        self.time_values = samples[1::2][:kept]
+        self.size = size
+        self.inode = stat.st_ino
+        # Rewrite in full if anything was dropped, so appends line up with the arrays again
+        self._rewrite_index = (
+            os.path.getsize(self.log_file + INDEX_SUFFIX) != INDEX_HEADER.size + line_ends.itemsize * len(line_ends)
+            or os.path.getsize(self.log_file + TIME_INDEX_SUFFIX) != INDEX_HEADER.size + samples.itemsize * 2 * kept
+        )
+        if not self._rewrite_index:
+            self._saved_lines = len(line_ends)
+            self._saved_times = kept
+
+    def refresh(self):
+        """Map any newly appended bytes and extend the line index over them"""
+        self.apply_scan(self.scan())
+
+    def scan(self):
+        """Find the line ends appended since the last refresh, without changing the index.
+
+        Reads the file on its own, so callers can scan outside whatever lock
+        guards readers of this index and only hold it for apply_scan().
+        Returns the scan to pass to apply_scan().
+        """
+        try:
+            stat = os.stat(self.log_file)
+            size, inode = stat.st_size, stat.st_ino
+        except OSError:
+            size, inode = 0, None
+        # Truncated or replaced - rescan from scratch
+        replaced = size < self.size or inode != self.inode
+        pos = 0 if replaced or not self.line_ends else self.line_ends[-1]
+        ends = array('Q')
+        try:
+            with open(self.log_file, 'rb') as f:
+                f.seek(pos)
+                while pos < size:
+                    chunk = np.frombuffer(f.read(min(SCAN_CHUNK_BYTES, size - pos)), dtype=np.uint8)
+                    if not len(chunk):
+                        break
+                    ends.frombytes((np.flatnonzero(chunk == 10) + (pos + 1)).astype(np.uint64).tobytes())
+                    pos += len(chunk)
+        except OSError:
+            pass
+        return inode, size, replaced, ends
+
+    def apply_scan(self, scan):
+        """Extend the index with a scan() result and map the file at its new size"""
+        inode, size, replaced, ends = scan
+        if replaced:
+            self._reset(inode)
+        if size == self.size and self._map is not None:
+            return
+        if size == 0:
+            return
+
+        # A mapping can't grow, so map again at the new size
+        self.close()
+        self._file = open(self.log_file, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), size, access=mmap.ACCESS_READ)
+
+        first_new = len(self.line_ends)
+        self.line_ends.extend(ends)
+        self.size = size
+        self._sample_timestamps(first_new)
+
+    def _sample_timestamps(self, first_new):
+        step = self.sample_every
+        line = -(-first_new // step) * step
+        while line < len(self.line_ends):
+            start = self.line_offset(line)
+            timestamp = parse_line_timestamp(self._map[start:start + 21])
+            if timestamp is not None:
+                self.time_lines.append(line)
+                self.time_values.append(timestamp)
+            line += step
+
+    def save_index(self):
+        """Append index entries added since the last save to the sidecar files"""
+        # Timestamps are only sampled on new lines, so no new lines means nothing to write
+        if not self._rewrite_index and len(self.line_ends) == self._saved_lines:
+            return
+        indexed = self.line_ends[-1] if self.line_ends else 0
+        header = INDEX_HEADER.pack(
+            INDEX_MAGIC, self.inode or 0, indexed,
+            zlib.crc32(self._map[max(0, indexed - INDEX_TAIL_BYTES):indexed]) if self._map is not None else 0
+        )
+        samples = array('q')
+        for line, value in zip(self.time_lines[self._saved_times:], self.time_values[self._saved_times:]):
+            samples.append(line)
+            samples.append(value)
+        for suffix, values in ((INDEX_SUFFIX, self.line_ends[self._saved_lines:]), (TIME_INDEX_SUFFIX, samples)):
+            self._write_sidecar(self.log_file + suffix, header, values)
+        self._saved_lines = len(self.line_ends)
+        self._saved_times = len(self.time_lines)
+        self._rewrite_index = False
+
+    def _write_sidecar(self, path, header, values):
+        """Rewrite or append to one sidecar file, refreshing its header"""
+        if self._rewrite_index or not os.path.exists(path):
+            with open(path, 'wb') as f:
+                f.write(header)
+                values.tofile(f)
+            return
+        with open(path, 'r+b') as f:
+            f.write(header)
+            f.seek(0, os.SEEK_END)
+            values.tofile(f)
+
+    @property
+    def line_count(self):
+        """Number of lines, counting a trailing line without a newline"""
+        last_end = self.line_ends[-1] if self.line_ends else 0
+        return len(self.line_ends) + (1 if self.size > last_end else 0)
+
+    def line_offset(self, line):
+        """Byte offset where the given 0-based line starts"""
+        if line <= 0:
+            return 0
+        if line > len(self.line_ends):
+            return self.size
+        return self.line_ends[line - 1]
+
+    def line_range_bytes(self, start, end):
+        """Zero-copy memoryview over lines [start, end)"""
+        if self._map is None:
+            return memoryview(b"")
+        end = min(end, self.line_count)
+        return memoryview(self._map)[self.line_offset(start):self.line_offset(end)]
+
+    def get_lines(self, start, end):
+        """Decoded text of lines [start, end)"""
+        with self.line_range_bytes(start, end) as view:
+            return str(view, 'utf-8', errors='replace')
+
+    def search(self, pattern, limit=None):
+        """Scan the mapping with a compiled bytes regex, returning matching line numbers"""
+        lines = []
+        if self._map is None:
+            return lines
+        for match in pattern.finditer(self._map):
+            line = bisect_right(self.line_ends, match.start())
+            if lines and lines[-1] == line:
+                continue
+            lines.append(line)
+            if limit is not None and len(lines) >= limit:
+                break
+        return lines
+
+    def find_line_at_time(self, timestamp):
+        """Return the first line logged at or after epoch seconds timestamp.
+
+        Binary-searches the sampled timestamps, then scans at most
+        sample_every lines forward from the nearest earlier sample.
+        """
+        sample = bisect_left(self.time_values, timestamp) - 1
+        line = self.time_lines[sample] if sample >= 0 else 0
+        end = self.time_lines[sample + 1] if sample + 1 < len(self.time_lines) else self.line_count
+        while line < end:
+            start = self.line_offset(line)
+            value = parse_line_timestamp(self._map[start:start + 21]) if self._map is not None else None
+            if value is not None and value >= timestamp:
+                return line
+            line += 1
+        return min(end, max(self.line_count - 1, 0))
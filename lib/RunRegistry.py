@@ -0,0 +1,141 @@
+import sqlite3
+import threading
+from datetime import datetime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    container_name TEXT NOT NULL,
+    log_message TEXT,
+    iterations INTEGER,
+    start_time TEXT NOT NULL,
+    end_time TEXT,
+    status TEXT NOT NULL,
+    exit_code INTEGER,
+    pid INTEGER,
+    exec_id TEXT,
+    log_file TEXT,
+    archive_run_id TEXT,
+    iterations_logged INTEGER,
+    iterations_per_sec REAL,
+    p50_gap_ms REAL,
+    p99_gap_ms REAL,
+    max_gap_s INTEGER,
+    stall_count INTEGER
+);
+CREATE INDEX IF NOT EXISTS runs_status ON runs (status, start_time);
+CREATE INDEX IF NOT EXISTS runs_container ON runs (container_name, start_time);
+CREATE INDEX IF NOT EXISTS runs_start_time ON runs (start_time);
+CREATE INDEX IF NOT EXISTS runs_log_file ON runs (log_file, archive_run_id);
+"""
+
+# Summary metric columns that finish_run accepts
+METRIC_COLUMNS = ("iterations_logged", "iterations_per_sec", "p50_gap_ms", "p99_gap_ms", "max_gap_s", "stall_count")
+
+
+class RunRegistry:
+    """SQLite (WAL) registry of Java app runs, safe to share across script threads"""
+
+    def __init__(self, db_file):
+        self.db_file = db_file
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        """Return this thread's connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_file, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def start_run(self, container_name, start_time, log_file, pid=None, exec_id=None,
+                  log_message=None, iterations=None):
+        """Record a new running run, ending any run still marked running in that container"""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE runs SET status = 'abandoned', end_time = ? WHERE container_name = ? AND status = 'running'",
+                (_now(), container_name)
+            )
+            cursor = conn.execute(
+                "INSERT INTO runs (container_name, log_message, iterations, start_time, status, pid, exec_id, log_file)"
+                " VALUES (?, ?, ?, ?, 'running', ?, ?, ?)",
+                (container_name, log_message, iterations, start_time, pid, exec_id, log_file)
+            )
+            return cursor.lastrowid
+
+    def active_run(self, container_name=None):
+        """Return the most recent run still marked running, as a dict, or None"""
+        query = "SELECT * FROM runs WHERE status = 'running'"
+        params = ()
+        if container_name is not None:
+            query += " AND container_name = ?"
+            params = (container_name,)
+        row = self._connect().execute(query + " ORDER BY start_time DESC, id DESC LIMIT 1", params).fetchone()
+        return dict(row) if row else None
+
+    def finish_run(self, container_name, status, exit_code=None, metrics=None):
+        """Mark the running run of a container as ended with its exit code and summary metrics"""
+        metrics = {key: value for key, value in (metrics or {}).items() if key in METRIC_COLUMNS}
+        assignments = "".join(f", {column} = ?" for column in metrics)
+        with self._connect() as conn:
+            conn.execute(
+                f"UPDATE runs SET status = ?, end_time = ?, exit_code = ?{assignments}"
+                " WHERE container_name = ? AND status = 'running'",
+                (status, _now(), exit_code, *metrics.values(), container_name)
+            )
+
+    def last_finished_run(self, log_file):
+        """Return the latest finished, not yet archived run of a log file, as a dict, or None"""
+        row = self._connect().execute(
+            "SELECT * FROM runs WHERE log_file = ? AND archive_run_id IS NULL AND status != 'running'"
+            " ORDER BY start_time DESC, id DESC LIMIT 1",
+            (log_file,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def set_archive(self, run_id, archive_run_id):
+        """Link a run to its archive"""
+        with self._connect() as conn:
+            conn.execute("UPDATE runs SET archive_run_id = ? WHERE id = ?", (archive_run_id, run_id))
+
+    def clear_archive(self, archive_run_ids):
+        """Unlink runs from archives that were deleted"""
+        archive_run_ids = list(archive_run_ids)
+        if not archive_run_ids:
+            return
+        with self._connect() as conn:
+            conn.execute(
+                f"UPDATE runs SET archive_run_id = NULL WHERE archive_run_id IN ({', '.join('?' * len(archive_run_ids))})",
+                archive_run_ids
+            )
+
+    def recent_runs(self, limit=50, container_name=None, status=None):
+        """Return the most recent runs as dicts, optionally filtered"""
+        clauses, params = [], []
+        if container_name is not None:
+            clauses.append("container_name = ?")
+            params.append(container_name)
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._connect().execute(
+            f"SELECT * FROM runs{where} ORDER BY start_time DESC, id DESC LIMIT ?", (*params, limit)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def close(self):
+        """Close the calling thread's connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def _now():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
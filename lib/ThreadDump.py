@@ -0,0 +1,96 @@
+import re
+
+# '"main" #1 prio=5 os_prio=0 cpu=12.34ms elapsed=5.67s tid=0x00007f... nid=0x1 waiting on condition'
+HEADER_FIELDS = re.compile(r"(\w+)=(\S+)")
+STATE_PREFIX = "java.lang.Thread.State: "
+# States in which an unchanged stack between two dumps means no progress
+ACTIVE_STATES = ("RUNNABLE", "BLOCKED")
+
+
+def parse_thread(block):
+    """Parse one thread block of `jcmd <pid> Thread.print` into a dict"""
+    lines = block.split("\n")
+    header = lines[0]
+    name_end = header.find('"', 1)
+    fields = dict(HEADER_FIELDS.findall(header[name_end + 1:]))
+    cpu = fields.get('cpu', '')
+    state = None
+    frames = []
+    locks = []
+    for line in lines[1:]:
+        stripped = line.strip()
+        if stripped.startswith("at "):
+            frames.append(stripped[3:])
+        elif stripped.startswith("- "):
+            locks.append(stripped[2:])
+        elif stripped.startswith(STATE_PREFIX):
+            state = stripped[len(STATE_PREFIX):].split(" ", 1)[0]
+    return {
+        'name': header[1:name_end],
+        'tid': fields.get('tid'),
+        'daemon': " daemon " in header[name_end:],
+        # JVM-internal threads (GC, compiler, VM thread) have no Java state
+        'state': state or "VM",
+        'cpu_ms': float(cpu[:-2]) if cpu.endswith("ms") else None,
+        'frames': tuple(frames),
+        'locks': locks
+    }
+
+
+class ThreadDump:
+    """A parsed thread dump: per-thread state, frames and locks"""
+
+    def __init__(self, text, captured_at=None):
+        self.captured_at = captured_at
+        # Every thread block starts with a quoted name at the start of a line
+        blocks = ("\n" + text).split('\n"')[1:]
+        self.threads = [parse_thread('"' + block.split("\n\n", 1)[0]) for block in blocks]
+
+    def __len__(self):
+        return len(self.threads)
+
+    def state_counts(self):
+        """Return {state: thread count}"""
+        counts = {}
+        for thread in self.threads:
+            counts[thread['state']] = counts.get(thread['state'], 0) + 1
+        return counts
+
+    def stack_groups(self):
+        """Group threads with identical state and frames; returns [(state, frames, names)] largest first"""
+        groups = {}
+        for thread in self.threads:
+            key = (thread['state'], thread['frames'])
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = (thread['state'], thread['frames'], [])
+            group[2].append(thread['name'])
+        return sorted(groups.values(), key=lambda group: len(group[2]), reverse=True)
+
+
+def diff_thread_dumps(previous, current):
+    """Compare two dumps of the same JVM, matching threads by name and tid.
+
+    Returns a dict with lists of thread dicts (from current) under 'stuck'
+    (same frames and still RUNNABLE/BLOCKED), 'unchanged' (same frames,
+    waiting), 'changed', 'new' and the names of 'ended' threads. Each
+    matched thread gets 'cpu_delta_ms' when both dumps report cpu time.
+    """
+    before = {(thread['name'], thread['tid']): thread for thread in previous.threads}
+    result = {'stuck': [], 'unchanged': [], 'changed': [], 'new': [], 'ended': []}
+    for thread in current.threads:
+        old = before.pop((thread['name'], thread['tid']), None)
+        if old is None:
+            result['new'].append(thread)
+            continue
+        thread = dict(thread)
+        if thread['cpu_ms'] is not None and old['cpu_ms'] is not None:
+            thread['cpu_delta_ms'] = thread['cpu_ms'] - old['cpu_ms']
+        if thread['frames'] != old['frames']:
+            result['changed'].append(thread)
+        elif thread['state'] in ACTIVE_STATES and thread['frames']:
+            result['stuck'].append(thread)
+        else:
+            result['unchanged'].append(thread)
+    result['ended'] = [name for name, _ in before]
+    return result
@@ -0,0 +1,97 @@
+import threading
+import numpy as np
+
+
+class TimeSeriesRing:
+    """Fixed-capacity ring of timestamped samples with named float columns.
+
+    Memory is allocated once (capacity rows); the oldest samples are
+    overwritten. Appends and snapshots are thread-safe, so a background
+    sampler can write while script threads read.
+    """
+
+    def __init__(self, columns, capacity):
+        self.columns = tuple(columns)
+        self.capacity = capacity
+        self._times = np.zeros(capacity, dtype=np.float64)
+        self._values = np.full((capacity, len(self.columns)), np.nan, dtype=np.float64)
+        self._next = 0
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._size
+
+    def append(self, timestamp, values):
+        """Add one sample; values is a dict keyed by column name (missing -> NaN)"""
+        row = [values.get(column, np.nan) for column in self.columns]
+        with self._lock:
+            self._times[self._next] = timestamp
+            self._values[self._next] = row
+            self._next = (self._next + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+
+    def clear(self):
+        """Drop all samples"""
+        with self._lock:
+            self._next = 0
+            self._size = 0
+
+    def last(self):
+        """Return (timestamp, {column: value}) of the newest sample, or None"""
+        with self._lock:
+            if self._size == 0:
+                return None
+            index = (self._next - 1) % self.capacity
+            return self._times[index], dict(zip(self.columns, self._values[index].tolist()))
+
+    def snapshot(self, since=None):
+        """Return (timestamps, {column: values}) copies in time order, optionally after since"""
+        with self._lock:
+            order = (np.arange(self._size) + self._next - self._size) % self.capacity
+            times = self._times[order]
+            values = self._values[order]
+        if since is not None:
+            keep = times > since
+            times, values = times[keep], values[keep]
+        return times, {column: values[:, i] for i, column in enumerate(self.columns)}
+
+
+class MultiResolutionSeries:
+    """Samples kept at several resolutions, each in its own fixed-size ring.
+
+    levels is a sequence of (step seconds, capacity). Every level averages
+    the samples falling in each step-aligned bucket and appends the mean
+    when the bucket closes, so memory stays fixed however long it runs.
+    """
+
+    def __init__(self, columns, levels=((1, 600), (10, 360), (60, 1440))):
+        self.columns = tuple(columns)
+        self.levels = tuple(levels)
+        self.rings = {step: TimeSeriesRing(self.columns, capacity) for step, capacity in self.levels}
+        self._buckets = {step: None for step, _ in self.levels}
+        self._sums = {step: np.zeros(len(self.columns)) for step, _ in self.levels}
+        self._counts = {step: np.zeros(len(self.columns)) for step, _ in self.levels}
+
+    def append(self, timestamp, values):
+        """Add one sample; values is a dict keyed by column name (missing -> ignored)"""
+        row = np.array([values.get(column, np.nan) for column in self.columns], dtype=np.float64)
+        present = ~np.isnan(row)
+        for step, _ in self.levels:
+            bucket = timestamp // step * step
+            if self._buckets[step] is not None and bucket != self._buckets[step]:
+                self._flush(step)
+            self._buckets[step] = bucket
+            self._sums[step][present] += row[present]
+            self._counts[step][present] += 1
+
+    def _flush(self, step):
+        counts = self._counts[step]
+        means = np.divide(self._sums[step], counts, out=np.full(len(self.columns), np.nan), where=counts > 0)
+        self.rings[step].append(self._buckets[step], dict(zip(self.columns, means)))
+        self._sums[step][:] = 0
+        self._counts[step][:] = 0
+
+    def snapshot(self, step, since=None):
+        """Return (timestamps, {column: values}) at one resolution"""
+        return self.rings[step].snapshot(since)
@@ -1,5 +1,6 @@
 import streamlit as st
 from ui.java_container_ui import render_java_container_section
+from ui.java_fleet_ui import render_java_fleet_section
 
 # Set page configuration
 st.set_page_config(
@@ -13,7 +14,7 @@ st.set_page_config(
 st.sidebar.title("Navigation")
 section = st.sidebar.radio(
     "Go to",
-    ["Java Container", "Oracle Monitoring"]
+    ["Java Container", "Java Fleet", "Oracle Monitoring"]
 )
 
 st.sidebar.markdown("---")
@@ -26,6 +27,9 @@ st.sidebar.info(
 if section == "Java Container":
     render_java_container_section()
 
+elif section == "Java Fleet":
+    render_java_fleet_section()
+
 elif section == "Oracle Monitoring":
     st.title("Oracle Monitoring")
     st.info("Oracle monitoring section - to be implemented")
\ No newline at end of file
@@ -0,0 +1,93 @@
+import struct
+import pytest
+from lib.JvmMetrics import parse_perfdata, jvm_metrics, PERFDATA_MAGIC, PROLOGUE_FORMAT, ENTRY_FORMAT
+
+MIB = 1024 * 1024
+COUNTERS = {
+    "sun.os.hrt.frequency": 1000000000,
+    "sun.os.hrt.ticks": 90 * 1000000000,
+    "sun.gc.generation.0.space.0.used": 3 * MIB,
+    "sun.gc.generation.0.space.1.used": 1 * MIB,
+    "sun.gc.generation.1.space.0.used": 6 * MIB,
+    "sun.gc.generation.0.capacity": 16 * MIB,
+    "sun.gc.generation.1.capacity": 32 * MIB,
+    "sun.gc.generation.0.maxCapacity": 64 * MIB,
+    "sun.gc.generation.1.maxCapacity": 192 * MIB,
+    "sun.gc.metaspace.used": 12 * MIB,
+    "sun.gc.collector.0.invocations": 7,
+    "sun.gc.collector.0.time": 35 * 1000000,
+    "sun.gc.collector.1.invocations": 1,
+    "sun.gc.collector.1.time": 120 * 1000000,
+    "java.threads.live": 11,
+    "java.threads.daemon": 9,
+    "java.property.java.vm.name": "OpenJDK 64-Bit Server VM",
+}
+
+
+def perfdata(counters, byte_order=1, slack=64):
+    """Lay out counters the way HotSpot's PerfMemory does: prologue, then
+    entries of header, NUL-terminated name and 8-byte aligned value"""
+    endian = "<" if byte_order == 1 else ">"
+    prologue_size = struct.calcsize(endian + PROLOGUE_FORMAT)
+    header_size = struct.calcsize(endian + ENTRY_FORMAT)
+    entries = b""
+    for name, value in counters.items():
+        name_bytes = name.encode('ascii') + b"\0"
+        data_offset = (header_size + len(name_bytes) + 7) // 8 * 8
+        if isinstance(value, str):
+            raw, vector_length, data_type = value.encode('utf-8') + b"\0", len(value) + 8, ord('B')
+            raw = raw.ljust(vector_length, b"\0")
+        else:
+            raw, vector_length, data_type = struct.pack(endian + "q", value), 0, ord('J')
+        entry_length = (data_offset + len(raw) + 7) // 8 * 8
+        header = struct.pack(endian + ENTRY_FORMAT, entry_length, header_size, vector_length, data_type, 0, 1, 3, data_offset)
+        body = (header + name_bytes).ljust(data_offset, b"\0") + raw
+        entries += body.ljust(entry_length, b"\0")
+    used = prologue_size + len(entries)
+    prologue = struct.pack(">I", PERFDATA_MAGIC) + struct.pack(
+        endian + PROLOGUE_FORMAT[1:], byte_order, 2, 0, 1, used, 0, 0, prologue_size, len(counters))
+    return prologue + entries + b"\0" * slack
+
+
+@pytest.mark.parametrize("byte_order", [1, 0])
+def test_parses_long_and_string_counters(byte_order):
+    assert parse_perfdata(perfdata(COUNTERS, byte_order)) == COUNTERS
+
+
+def test_rejects_other_buffers():
+    with pytest.raises(ValueError):
+        parse_perfdata(b"\0" * 64)
+    data = bytearray(perfdata(COUNTERS))
+    data[5] = 1
+    with pytest.raises(ValueError):
+        parse_perfdata(bytes(data))
+
+
+def test_stops_at_truncated_entries():
+    data = perfdata(COUNTERS, slack=0)
+    counters = parse_perfdata(data[:len(data) - 40])
+    assert list(counters) == list(COUNTERS)[:len(counters)]
+    assert 0 < len(counters) < len(COUNTERS)
+
+
+def test_jvm_metrics():
+    metrics = jvm_metrics(parse_perfdata(perfdata(COUNTERS)))
+    assert metrics == {
+        "heap_used_mb": 10.0,
+        "heap_committed_mb": 48.0,
+        "heap_max_mb": 256.0,
+        "metaspace_used_mb": 12.0,
+        "young_gc_count": 7,
+        "young_gc_time_ms": 35.0,
+        "old_gc_count": 1,
+        "old_gc_time_ms": 120.0,
+        "threads_live": 11,
+        "threads_daemon": 9,
+        "uptime_s": 90.0,
+    }
+
+
+def test_jvm_metrics_leaves_out_missing_counters():
+    metrics = jvm_metrics({"java.threads.live": 4})
+    assert metrics["threads_live"] == 4
+    assert "old_gc_count" not in metrics and "uptime_s" not in metrics
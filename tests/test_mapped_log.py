@@ -0,0 +1,105 @@
+import os
+from array import array
+from lib.MappedLog import MappedLog, INDEX_HEADER, INDEX_SUFFIX, TIME_INDEX_SUFFIX, read_index_file
+
+
+def write_log(path, lines, start=0):
+    with open(path, 'a') as f:
+        for i in range(start, start + lines):
+            f.write(f"[2026-01-01 00:{i // 60 % 60:02d}:{i % 60:02d}] Loop {i}: Hello\n")
+
+
+def indexed_log(tmp_path, lines=2500):
+    log_file = str(tmp_path / "app.log")
+    write_log(log_file, lines)
+    mapped = MappedLog(log_file)
+    mapped.save_index()
+    mapped.close()
+    return log_file
+
+
+def test_adopts_matching_sidecars(tmp_path):
+    log_file = indexed_log(tmp_path)
+    mapped = MappedLog(log_file, load_index=False)
+    expected = (mapped.line_ends.tolist(), mapped.time_lines.tolist(), mapped.time_values.tolist())
+    mapped.close()
+
+    mapped = MappedLog(log_file)
+    assert not mapped._rewrite_index
+    assert (mapped.line_ends.tolist(), mapped.time_lines.tolist(), mapped.time_values.tolist()) == expected
+    mapped.close()
+
+
+def test_extends_adopted_index_after_append(tmp_path):
+    log_file = indexed_log(tmp_path)
+    write_log(log_file, 10, start=2500)
+    mapped = MappedLog(log_file)
+    assert not mapped._rewrite_index
+    assert mapped.line_count == 2510
+    assert mapped.get_lines(2509, 2510).endswith("Loop 2509: Hello\n")
+    mapped.close()
+
+
+def test_rejects_log_rewritten_in_place(tmp_path):
+    log_file = indexed_log(tmp_path)
+    with open(log_file, 'rb') as f:
+        data = f.read()
+    # Same size and inode, different bytes before the last indexed line end
+    with open(log_file, 'r+b') as f:
+        f.write(data.replace(b"Loop 2499: Hello", b"Loop 2499: Howdy"))
+    mapped = MappedLog(log_file)
+    assert mapped._rewrite_index
+    assert mapped.get_lines(2499, 2500).endswith("Howdy\n")
+    mapped.close()
+
+
+def test_rejects_replaced_log(tmp_path):
+    log_file = indexed_log(tmp_path)
+    os.remove(log_file)
+    write_log(log_file, 10)
+    mapped = MappedLog(log_file)
+    assert mapped._rewrite_index
+    assert mapped.line_count == 10
+    mapped.close()
+
+
+def test_rejects_sidecars_without_header(tmp_path):
+    log_file = indexed_log(tmp_path)
+    _, line_ends = read_index_file(log_file + INDEX_SUFFIX, 'Q')
+    with open(log_file + INDEX_SUFFIX, 'wb') as f:
+        line_ends.tofile(f)
+    mapped = MappedLog(log_file)
+    assert mapped._rewrite_index
+    assert mapped.line_count == 2500
+    mapped.close()
+
+
+def test_drops_partial_entries_and_rewrites(tmp_path):
+    log_file = indexed_log(tmp_path)
+    # An interrupted append: half a line end and an unpaired timestamp sample
+    with open(log_file + INDEX_SUFFIX, 'ab') as f:
+        f.write(b"\x01" * 3)
+    with open(log_file + TIME_INDEX_SUFFIX, 'ab') as f:
+        array('q', [9999]).tofile(f)
+
+    mapped = MappedLog(log_file)
+    assert mapped._rewrite_index
+    assert mapped.line_count == 2500
+    assert mapped.time_lines.tolist() == [0, 1000, 2000]
+    mapped.save_index()
+    mapped.close()
+
+    assert os.path.getsize(log_file + INDEX_SUFFIX) == INDEX_HEADER.size + 8 * 2500
+    assert os.path.getsize(log_file + TIME_INDEX_SUFFIX) == INDEX_HEADER.size + 16 * 3
+    mapped = MappedLog(log_file)
+    assert not mapped._rewrite_index
+    mapped.close()
+
+
+def test_save_index_skips_unchanged_index(tmp_path):
+    log_file = indexed_log(tmp_path)
+    mapped = MappedLog(log_file)
+    os.remove(log_file + INDEX_SUFFIX)
+    mapped.save_index()
+    assert not os.path.exists(log_file + INDEX_SUFFIX)
+    mapped.close()
@@ -1,40 +1,102 @@
 import streamlit as st
 import os
+import re
+import atexit
 import time
+import numpy as np
 from datetime import datetime
 from lib.JavaContainerManager import JavaContainerManager
+from lib.LogBuffer import LogBuffer
+from lib.AdaptivePoller import AdaptivePoller
+from lib.ThreadDump import diff_thread_dumps
+
+# Size of the in-memory live log window; older lines are paged from the file
+LOG_VIEW_MAX_LINES = int(os.environ.get("LOG_VIEW_MAX_LINES", 500))
+LOG_VIEW_MAX_BYTES = int(os.environ.get("LOG_VIEW_MAX_BYTES", 64 * 1024))
+LOG_PAGE_LINES = int(os.environ.get("LOG_PAGE_LINES", 200))
+# Lines per page in the memory-mapped final log view
+FINAL_LOG_PAGE_LINES = int(os.environ.get("FINAL_LOG_PAGE_LINES", 500))
+# Maximum number of matching lines shown by the log search
+LOG_SEARCH_LIMIT = int(os.environ.get("LOG_SEARCH_LIMIT", 200))
+# Iteration timeline: gaps above this count as stalls; chart is downsampled to this many points
+STALL_THRESHOLD_SECONDS = float(os.environ.get("STALL_THRESHOLD_SECONDS", 2.0))
+TIMELINE_MAX_POINTS = int(os.environ.get("TIMELINE_MAX_POINTS", 2000))
+# Number of past runs listed in the run history
+RUN_HISTORY_LIMIT = int(os.environ.get("RUN_HISTORY_LIMIT", 100))
+
+# Host directory mounted into the container for the GC log
+GC_LOG_DIR = os.path.join(os.getcwd(), "java_app", "gc")
+
+# Default length of a Flight Recorder profile (seconds)
+PROFILE_SECONDS = int(os.environ.get("PROFILE_SECONDS", 30))
+
+# Interval between JVM metric samples (one exec each)
+JVM_SAMPLE_SECONDS = float(os.environ.get("JVM_SAMPLE_SECONDS", 2.0))
+
+# How often the running-state panel re-runs on its own, and the longest it
+# waits for new log output within one of its own re-runs (seconds)
+LIVE_REFRESH_SECONDS = float(os.environ.get("LIVE_REFRESH_SECONDS", 1.0))
+# Upper bound for the status poll interval while a run produces no output
+STATUS_POLL_MAX_SECONDS = float(os.environ.get("STATUS_POLL_MAX_SECONDS", 30.0))
+
+@st.cache_resource
+def get_java_manager():
+    """Return the process-wide JavaContainerManager shared by all sessions"""
+    manager = JavaContainerManager(stall_threshold=STALL_THRESHOLD_SECONDS)
+    atexit.register(manager.close)
+    return manager
+
 
 def render_java_container_section():
     """Render the Java Container section UI"""
     st.title("☕ Java Container Executor")
     st.markdown("Execute a Java application inside a Docker container and stream the logs.")
     
-    # Initialize Java Container Manager
-    if 'java_manager' not in st.session_state:
-        st.session_state.java_manager = JavaContainerManager()
-    
-    manager = st.session_state.java_manager
+    # Shared Java Container Manager (one Docker client for all sessions)
+    manager = get_java_manager()
     
-    # Initialize session state from persisted file
+    # Initialize session state from the run registry
     _initialize_session_state(manager)
     
     # Check if there's an active process from previous run
     if st.session_state.is_running and st.session_state.container_name:
+        # Tells the fragment this is a full-page run, which must not wait for output
+        st.session_state.page_run = True
         _render_running_state(manager)
     else:
         st.session_state.is_running = False
-        manager.clear_process_state()
+        _render_finished_state(manager)
+
+    # Search and iteration timeline over the current run's log
+    if st.session_state.log_file:
+        _render_log_search(manager)
+        _render_iteration_timeline(manager)
+
+    # GC pauses from the last run started with GC logging
+    _render_gc_analysis(manager)
+
+    # Flight Recorder profile of the running app
+    _render_profiler(manager)
+
+    # Thread dumps of the current and past runs
+    _render_thread_dumps(manager)
+
+    # Compressed logs of previous runs
+    _render_archived_runs(manager)
+
+    # Past runs and how they ended
+    _render_run_history(manager)
 
     # Inputs
-    log_message, iterations = _render_input_fields()
+    log_message, iterations, gc_logging = _render_input_fields()
 
     # Build & Run button
-    _render_build_run_button(manager, log_message, iterations)
+    _render_build_run_button(manager, log_message, iterations, gc_logging)
 
 
 
 def _initialize_session_state(manager):
-    """Initialize session state from persisted file"""
+    """Initialize session state from the active run in the run registry"""
     if 'process_pid' not in st.session_state:
         state = manager.load_process_state()
         if state:
@@ -49,27 +111,70 @@ def _initialize_session_state(manager):
             st.session_state.log_file = None
             st.session_state.start_time = None
             st.session_state.container_name = manager.container_name
+        st.session_state.run_outcome = []
 
 
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
 def _render_running_state(manager):
-    """Render UI when a process is running"""
+    """Render UI when a process is running.
+    
+    Runs as a fragment so only this panel refreshes while the app is running.
+    On its own re-runs it waits on the log watcher (inotify where available)
+    for up to LIVE_REFRESH_SECONDS and returns as soon as the log changes,
+    so new output shows up when it is flushed rather than on the next tick;
+    the next timed re-run is already queued by then. Full-page runs only
+    check the watcher's counter, so the rest of the page isn't held up.
+    The log is only read when the counter moved.
+    Container and process status are polled on an adaptive schedule: the
+    interval backs off while the log is quiet and snaps back on new output.
+    """
+    if st.session_state.get('status_poller') is None:
+        st.session_state.status_poller = AdaptivePoller(LIVE_REFRESH_SECONDS, STATUS_POLL_MAX_SECONDS)
+        st.session_state.run_status = None
+    poller = st.session_state.status_poller
+    page_run = st.session_state.pop('page_run', False)
+    
+    buffer = None
+    if st.session_state.log_file:
+        log_file = st.session_state.log_file
+        seen = st.session_state.get('log_generation')
+        if page_run or seen is None or seen[0] != log_file:
+            generation = (log_file, manager.get_log_generation(log_file))
+        else:
+            # Return as soon as the log changes instead of waiting out the refresh period
+            generation = (log_file, manager.wait_for_log_change(log_file, seen[1], LIVE_REFRESH_SECONDS))
+        # Only touch the log when the watcher saw it change since the last run
+        if generation != seen:
+            st.session_state.log_generation = generation
+            buffer, has_new_logs = _read_new_logs(manager)
+            if has_new_logs:
+                poller.activity()
+                manager.update_log_index(st.session_state.log_file)
+        else:
+            buffer = st.session_state.get('log_buffer')
+    
+    if poller.due():
+        status = _poll_run_status(manager)
+        poller.polled(status != st.session_state.run_status)
+        st.session_state.run_status = status
+    
     # First check if container is running
-    if not manager.is_container_running(st.session_state.container_name):
-        st.warning(f"⚠️ Container {st.session_state.container_name} is not running")
-        st.session_state.is_running = False
-        manager.clear_process_state()
-        
-        # Show final logs if available
-        _show_final_logs(manager)
+    if st.session_state.run_status == "container_stopped":
+        outcome = [("warning", f"⚠️ Container {st.session_state.container_name} is not running")]
+        status = "container_stopped"
+        if manager.was_oom_killed(st.session_state.container_name):
+            outcome.append(("error", "💥 The container was killed because it ran out of memory"))
+            status = "oom_killed"
+        _finish_run(manager, outcome, status)
     
     # Check if Java process is still running inside container
-    elif not manager.is_java_process_running(st.session_state.container_name):
-        st.success(f"✅ Java application completed! (Container: {st.session_state.container_name})")
-        st.session_state.is_running = False
-        manager.clear_process_state()
-        
-        # Show final logs
-        _show_final_logs(manager)
+    elif st.session_state.run_status == "java_stopped":
+        exit_code = manager.get_java_exit_code(st.session_state.container_name)
+        if exit_code is None or exit_code == 0:
+            outcome = [("success", f"✅ Java application completed! (Container: {st.session_state.container_name})")]
+        else:
+            outcome = [("error", f"❌ Java application exited with code {exit_code} (Container: {st.session_state.container_name})")]
+        _finish_run(manager, outcome, "completed" if not exit_code else "failed", exit_code)
     
     # Container is running and Java process is active
     else:
@@ -78,17 +183,567 @@ def _render_running_state(manager):
         # Show stop button
         _render_stop_button(manager)
         
+        # Throughput and stall detection
+        if st.session_state.log_file:
+            _render_throughput_panel(manager)
+        
+        # Heap, GC and thread counters sampled from the JVM in the background
+        _render_jvm_metrics(manager)
+        
+        # CPU, memory and I/O of the container, streamed in the background
+        _render_container_resources(manager)
+        
+        # Flight Recorder capture started from the profiler section
+        _render_profile_progress(manager)
+        
         # Stream logs from the active process
-        _stream_live_logs(manager)
+        _stream_live_logs(manager, buffer)
+
+
+def _poll_run_status(manager):
+    """Return 'container_stopped', 'java_stopped' or 'running' for the current run"""
+    if not manager.is_container_running(st.session_state.container_name):
+        return "container_stopped"
+    if not manager.is_java_process_running(st.session_state.container_name):
+        return "java_stopped"
+    return "running"
+
+
+def _finish_run(manager, outcome, status, exit_code=None):
+    """Record how the run ended and re-run the whole page to leave the running state"""
+    st.session_state.is_running = False
+    st.session_state.run_outcome = outcome
+    st.session_state.status_poller = None
+    st.session_state.pop('final_log_page', None)
+    metrics = {}
+    if st.session_state.log_file:
+        manager.update_log_index(st.session_state.log_file)
+        metrics = manager.get_run_metrics(st.session_state.log_file)
+    manager.clear_process_state(st.session_state.container_name, status, exit_code, metrics)
+    manager.stop_jvm_metrics(st.session_state.container_name)
+    manager.stop_container_stats(st.session_state.container_name)
+    st.rerun()
+
+
+def _render_finished_state(manager):
+    """Render the outcome and final logs of the last run, if any"""
+    for level, message in st.session_state.run_outcome:
+        getattr(st, level)(message)
+    if st.session_state.run_outcome:
+        _show_final_logs(manager)
+
+
+def _read_new_logs(manager):
+    """Feed newly written log lines into the session's bounded log window.
+    
+    Returns (buffer, has_new_logs).
+    """
+    log_file = st.session_state.log_file
+    tailer = st.session_state.get('log_tailer')
+    if tailer is None or tailer.log_file != log_file:
+        # Older lines are reached through the pager, so only the window's worth is read
+        tailer = manager.open_log_tailer(log_file, LOG_VIEW_MAX_BYTES)
+        st.session_state.log_tailer = tailer
+        st.session_state.log_buffer = LogBuffer(LOG_VIEW_MAX_LINES, LOG_VIEW_MAX_BYTES)
+        st.session_state.older_log_page = None
+    
+    buffer = st.session_state.log_buffer
+    new_content = tailer.read_new()
+    if tailer.restarted:
+        buffer.clear()
+        st.session_state.older_log_page = None
+    if new_content:
+        buffer.append(new_content, tailer.chunk_offset)
+    return buffer, bool(new_content)
+
+
+def _render_older_logs(manager, buffer):
+    """Render a pager over log lines that have scrolled out of the live window"""
+    if not buffer.first_offset:
+        return
+    
+    with st.expander("Older Logs"):
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("⬆️ Load older"):
+                page = st.session_state.older_log_page
+                end_offset = page[0] if page else buffer.first_offset
+                if end_offset > 0:
+                    start_offset, _ = manager.read_logs_before(
+                        st.session_state.log_file, end_offset, LOG_PAGE_LINES, LOG_VIEW_MAX_BYTES
+                    )
+                    st.session_state.older_log_page = (start_offset, end_offset)
+        with col2:
+            if st.button("⬇️ Back to latest"):
+                st.session_state.older_log_page = None
+        
+        page = st.session_state.older_log_page
+        if page:
+            # Only the current page is kept on screen, never the whole history
+            _, content = manager.read_logs_before(
+                st.session_state.log_file, page[1], LOG_PAGE_LINES, LOG_VIEW_MAX_BYTES
+            )
+            st.caption(f"Bytes {page[0]}-{page[1]} of the log file")
+            st.code(content, language="plaintext")
+
+
+def _get_mapped_log(manager):
+    """Return the session's memory-mapped view of the current log file"""
+    mapped = st.session_state.get('mapped_log')
+    if mapped is None or mapped.log_file != st.session_state.log_file:
+        if mapped is not None:
+            mapped.close()
+        mapped = manager.open_mapped_log(st.session_state.log_file)
+        st.session_state.mapped_log = mapped
+    else:
+        mapped.refresh()
+    return mapped
 
 
 def _show_final_logs(manager):
-    """Display final logs"""
+    """Display final logs, one page of the line index at a time"""
     if st.session_state.log_file:
-        content = manager.read_logs(st.session_state.log_file)
-        if content:
+        mapped = _get_mapped_log(manager)
+        line_count = mapped.line_count
+        if line_count:
             st.subheader("Application Logs (Final)")
-            st.code(content, language="plaintext")
+            pages = (line_count + FINAL_LOG_PAGE_LINES - 1) // FINAL_LOG_PAGE_LINES
+            _render_log_jump(mapped, pages)
+            page = st.number_input("Page", min_value=1, max_value=pages, key="final_log_page")
+            start = (page - 1) * FINAL_LOG_PAGE_LINES
+            end = min(start + FINAL_LOG_PAGE_LINES, line_count)
+            st.caption(f"Lines {start + 1}-{end} of {line_count}")
+            st.code(mapped.get_lines(start, end), language="plaintext")
+
+
+def _render_log_jump(mapped, pages):
+    """Render jump-to-line / jump-to-time controls that select the final log page"""
+    page = st.session_state.get('final_log_page')
+    if page is None or page > pages:
+        st.session_state.final_log_page = pages
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        line = st.number_input("Jump to line", min_value=1, max_value=mapped.line_count, value=1)
+        if st.button("Go to line"):
+            st.session_state.final_log_page = (line - 1) // FINAL_LOG_PAGE_LINES + 1
+    with col2:
+        when = st.text_input("Jump to time", placeholder="yyyy-MM-dd HH:mm:ss")
+        if st.button("Go to time") and when:
+            try:
+                timestamp = datetime.strptime(when.strip(), "%Y-%m-%d %H:%M:%S").timestamp()
+            except ValueError:
+                st.error("Time must look like 2024-01-31 13:45:00")
+            else:
+                line = mapped.find_line_at_time(timestamp)
+                st.session_state.final_log_page = line // FINAL_LOG_PAGE_LINES + 1
+
+
+def _render_log_search(manager):
+    """Render the log search box and its results"""
+    with st.expander("🔍 Search Logs"):
+        col1, col2 = st.columns([4, 1])
+        with col1:
+            query = st.text_input("Search", key="log_search_query", placeholder="word, phrase or regex")
+        with col2:
+            use_regex = st.checkbox("Regex", key="log_search_regex")
+        if not query:
+            return
+        
+        try:
+            start = time.perf_counter()
+            matches = manager.search_logs(st.session_state.log_file, query, regex=use_regex, limit=LOG_SEARCH_LIMIT)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+        except re.error as e:
+            st.error(f"Invalid regex: {e}")
+            return
+        
+        st.caption(f"{len(matches)} matching lines (first {LOG_SEARCH_LIMIT} shown) in {elapsed_ms:.1f} ms")
+        if matches:
+            st.code("\n".join(f"{line + 1:>8}: {text}" for line, text in matches), language="plaintext")
+
+
+def _render_throughput_panel(manager):
+    """Render live iterations/sec, gap percentiles and stall alerts.
+    
+    The running-state fragment updates the stats when new output arrives,
+    so this only reads them (catching up once if this process never has).
+    """
+    stats = manager.get_cached_iteration_stats(st.session_state.log_file)
+    if stats is None:
+        stats = manager.get_iteration_stats(st.session_state.log_file)
+    if stats.iterations == 0:
+        return
+    
+    recent_rate = stats.recent_rate()
+    p50 = stats.gaps.percentile(50)
+    p99 = stats.gaps.percentile(99)
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Iterations", stats.iterations, help=f"Last loop: {stats.last_loop}")
+    col2.metric("Iterations/sec", f"{recent_rate:.2f}" if recent_rate else "-", help=f"Over the last {stats.rate_window}s of log time")
+    col3.metric("p50 gap", f"{p50:.0f} ms" if p50 is not None else "-")
+    col4.metric("p99 gap", f"{p99:.0f} ms" if p99 is not None else "-", help=f"Max gap: {stats.max_gap}s")
+    
+    # The app sleeps ~1s per loop, so a long silence means it is stuck
+    silence = stats.seconds_since_last_iteration()
+    if silence is not None and silence > STALL_THRESHOLD_SECONDS:
+        st.error(f"⏸️ Stalled: no iteration for {silence:.0f}s (after loop {stats.last_loop})")
+    if stats.stalls:
+        loop, gap, _ = stats.stalls[-1]
+        st.warning(f"⚠️ {stats.stall_count} gaps over {stats.stall_threshold:g}s; latest before loop {loop} ({gap}s)")
+
+
+def _render_jvm_metrics(manager):
+    """Chart heap, GC and thread counters sampled from the running JVM"""
+    sampler = manager.start_jvm_metrics(st.session_state.container_name, JVM_SAMPLE_SECONDS)
+    with st.expander("☕ JVM Metrics", expanded=True):
+        times, columns = sampler.ring.snapshot()
+        if len(times) < 2:
+            st.caption(sampler.last_error or "Waiting for JVM samples...")
+            return
+        
+        latest = {name: float(np.nan_to_num(values[-1])) for name, values in columns.items()}
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Heap used", f"{latest['heap_used_mb']:.1f} MiB", help=f"Committed: {latest['heap_committed_mb']:.1f} MiB")
+        col2.metric("GCs", f"{latest['young_gc_count'] + latest['old_gc_count']:.0f}",
+                    help=f"Young: {latest['young_gc_count']:.0f}, old: {latest['old_gc_count']:.0f}")
+        col3.metric("Threads", f"{latest['threads_live']:.0f}")
+        
+        elapsed = times - times[0]
+        st.line_chart({
+            "t (s)": elapsed,
+            "heap used (MiB)": columns['heap_used_mb'],
+            "heap committed (MiB)": columns['heap_committed_mb']
+        }, x="t (s)")
+        # Counters are cumulative: chart GC time spent per sample interval
+        gc_time = np.nan_to_num(columns['young_gc_time_ms']) + np.nan_to_num(columns['old_gc_time_ms'])
+        st.line_chart({
+            "t (s)": elapsed[1:],
+            "GC time per interval (ms)": np.diff(gc_time),
+            "live threads": columns['threads_live'][1:]
+        }, x="t (s)")
+
+
+def _render_container_resources(manager):
+    """Chart container CPU, memory and I/O from the streamed stats buffers"""
+    watcher = manager.watch_container_stats(st.session_state.container_name)
+    with st.expander("📊 Container Resources", expanded=True):
+        resolutions = {"Last 10 min (1s)": 1, "Last hour (10s)": 10, "Last day (1 min)": 60}
+        label = st.radio("Window", list(resolutions), horizontal=True, key="resource_window")
+        times, columns = watcher.series.snapshot(resolutions[label])
+        if len(times) < 2:
+            st.caption(watcher.last_error or "Waiting for container stats...")
+            return
+        
+        latest = watcher.last_sample or {}
+        col1, col2, col3 = st.columns(3)
+        col1.metric("CPU", f"{latest.get('cpu_percent', 0):.1f}%")
+        col2.metric("Memory", f"{latest.get('mem_used_mb', 0):.0f} MiB",
+                    help=f"{latest.get('mem_percent', 0):.1f}% of {latest.get('mem_limit_mb', 0):.0f} MiB limit")
+        col3.metric("PIDs", f"{latest.get('pids', 0):.0f}")
+        
+        when = (times * 1000).astype('datetime64[ms]')
+        st.line_chart({"time": when, "CPU %": columns['cpu_percent']}, x="time")
+        st.line_chart({"time": when, "memory (MiB)": columns['mem_used_mb']}, x="time")
+        st.line_chart({
+            "time": when,
+            "block read (KiB/s)": columns['blk_read_bps'] / 1024,
+            "block write (KiB/s)": columns['blk_write_bps'] / 1024,
+            "net rx (KiB/s)": columns['net_rx_bps'] / 1024,
+            "net tx (KiB/s)": columns['net_tx_bps'] / 1024
+        }, x="time")
+
+
+def _downsample_max(x_name, x, columns):
+    """Chart data with at most TIMELINE_MAX_POINTS points: each bucket's first x and the max of each column.
+    
+    Keeps the chart payload bounded however long the run; a trailing
+    partial bucket is dropped.
+    """
+    buckets = max(1, len(x) // TIMELINE_MAX_POINTS + (len(x) % TIMELINE_MAX_POINTS > 0))
+    usable = len(x) // buckets * buckets
+    data = {x_name: x[:usable:buckets]}
+    for name, values in columns.items():
+        data[name] = values[:usable].reshape(-1, buckets).max(axis=1)
+    return data
+
+
+def _render_iteration_timeline(manager):
+    """Plot the gap before each loop iteration, parsed from the log"""
+    with st.expander("📈 Iteration Timeline"):
+        # The expander body runs even when collapsed: only parse the log on request
+        if not st.toggle("Parse log into timeline", key="show_iteration_timeline"):
+            return
+        columns = manager.get_log_columns(st.session_state.log_file)
+        if len(columns) < 2:
+            st.caption("Not enough iterations logged yet")
+            return
+        
+        gaps = columns.gaps()
+        loops = columns.loops.values[1:]
+        rate = columns.iteration_rate()
+        stalls = columns.stalls(STALL_THRESHOLD_SECONDS)
+        
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Iterations", len(columns))
+        col2.metric("Iterations/sec", f"{rate:.2f}" if rate else "-")
+        col3.metric(f"Gaps > {STALL_THRESHOLD_SECONDS:g}s", len(stalls))
+        
+        # Plot the largest gap per bucket
+        st.line_chart(_downsample_max("loop", loops, {"gap (s)": gaps}), x="loop", y="gap (s)")
+
+
+def _render_gc_analysis(manager):
+    """Render pause percentiles, allocation rate and a pause timeline from the GC log"""
+    gc_log_file = os.path.join(GC_LOG_DIR, "gc.log")
+    if not os.path.exists(gc_log_file) or os.path.getsize(gc_log_file) == 0:
+        return
+    
+    with st.expander("🗑️ GC Pauses"):
+        # The expander body runs even when collapsed: only parse the GC log on request
+        if not st.toggle("Parse GC log", key="show_gc_analysis"):
+            return
+        gc_log = manager.get_gc_log(gc_log_file)
+        if len(gc_log) == 0:
+            st.caption("No GC pauses logged yet")
+            return
+        
+        percentiles = gc_log.pause_percentiles()
+        allocation_rate = gc_log.allocation_rate()
+        overhead = gc_log.pause_overhead()
+        col1, col2, col3, col4, col5 = st.columns(5)
+        col1.metric("Pauses", len(gc_log))
+        col2.metric("p50 pause", f"{percentiles[50]:.2f} ms")
+        col3.metric("p99 pause", f"{percentiles[99]:.2f} ms", help=f"Max: {percentiles[100]:.2f} ms")
+        col4.metric("Allocation rate", f"{allocation_rate:.1f} MiB/s" if allocation_rate is not None else "-")
+        col5.metric("GC overhead", f"{overhead * 100:.2f}%" if overhead is not None else "-")
+        
+        # Plot the longest pause per bucket
+        st.line_chart(_downsample_max("uptime (s)", gc_log.uptimes.values, {
+            "pause (ms)": gc_log.durations.values,
+            "heap after (MiB)": gc_log.heap_after.values
+        }), x="uptime (s)")
+        st.dataframe([
+            {'Pause': kind, 'Count': count, 'Total (ms)': round(total, 2), 'Max (ms)': round(longest, 2)}
+            for kind, count, total, longest in gc_log.kind_summary()
+        ], hide_index=True)
+
+
+def _render_profile_progress(manager):
+    """Show the progress of a background profile; re-run the page once its summary is ready"""
+    recorder = manager.get_java_profiler(st.session_state.container_name)
+    if recorder is None:
+        return
+    if recorder.is_running:
+        if recorder.state == "recording":
+            remaining = max(recorder.seconds - (time.time() - recorder.started_at), 0)
+            st.progress(recorder.progress, text=f"🔥 Recording JFR profile... {remaining:.0f}s left")
+        else:
+            st.progress(1.0 if recorder.state == "summarizing" else 0.0, text=f"🔥 Profile {recorder.state}...")
+    elif st.session_state.get('profile_pending'):
+        st.session_state.profile_pending = False
+        st.rerun()
+
+
+def _render_profiler(manager):
+    """Render the "Profile for N seconds" button and the latest hot-method / allocation summary.
+    
+    The capture runs in the background; its progress is shown by the live panel.
+    """
+    recorder = manager.get_java_profiler(st.session_state.container_name)
+    profile = recorder.profile if recorder is not None else None
+    if not st.session_state.is_running and profile is None:
+        return
+    
+    with st.expander("🔥 Profiler (Java Flight Recorder)", expanded=profile is not None):
+        if st.session_state.is_running:
+            col1, col2 = st.columns([1, 3])
+            seconds = col1.number_input("Seconds", min_value=5, max_value=600, value=PROFILE_SECONDS, key="profile_seconds")
+            recording = recorder is not None and recorder.is_running
+            if col2.button(f"Profile for {seconds} seconds", disabled=recording):
+                success, message = manager.start_java_profile(seconds, st.session_state.container_name)
+                (st.info if success else st.error)(message)
+                st.session_state.profile_pending = success
+            elif recording:
+                st.caption("Recording in progress, see the live panel")
+        if recorder is not None and recorder.state == "failed":
+            st.error(recorder.message)
+        if profile is None:
+            return
+        
+        st.caption(f"{profile.samples} execution samples over {profile.seconds}s, "
+                   f"{profile.allocated / 1024 ** 2:.1f} MiB sampled allocations. Recording: {profile.recording_file}")
+        hot_tab, alloc_tab, flame_tab = st.tabs(["Hot methods", "Allocations", "Flame graph"])
+        with hot_tab:
+            st.dataframe([
+                {'Method': method, 'Self %': round(own * 100.0 / profile.samples, 1),
+                 'Total %': round(total * 100.0 / profile.samples, 1), 'Samples': own}
+                for method, own, total in profile.hot_methods()
+            ], hide_index=True)
+        with alloc_tab:
+            col1, col2 = st.columns(2)
+            col1.dataframe([
+                {'Class': name, 'MiB': round(weight / 1024 ** 2, 2)}
+                for name, weight in profile.allocation_by_class.most_common(20)
+            ], hide_index=True)
+            col2.dataframe([
+                {'Site': site, 'MiB': round(weight / 1024 ** 2, 2)}
+                for site, weight in profile.allocation_by_site.most_common(20)
+            ], hide_index=True)
+        with flame_tab:
+            rects = profile.flame_graph()
+            if not rects:
+                st.caption("No execution samples recorded")
+            else:
+                depth = max(rect['depth'] for rect in rects) + 1
+                st.vega_lite_chart({
+                    'data': {'values': rects},
+                    'height': 18 * depth,
+                    'encoding': {
+                        'x': {'field': 'start', 'type': 'quantitative', 'axis': None, 'scale': {'domain': [0, 1]}},
+                        'x2': {'field': 'end'},
+                        'y': {'field': 'depth', 'type': 'ordinal', 'sort': 'descending', 'axis': None}
+                    },
+                    'layer': [
+                        {
+                            'mark': {'type': 'bar', 'stroke': 'white', 'strokeWidth': 0.5},
+                            'encoding': {
+                                'color': {'field': 'method', 'type': 'nominal', 'legend': None, 'scale': {'scheme': 'oranges'}},
+                                'tooltip': [{'field': 'method'}, {'field': 'samples'}]
+                            }
+                        },
+                        {
+                            'mark': {'type': 'text', 'align': 'left', 'dx': 2, 'fontSize': 10, 'limit': 200},
+                            'encoding': {'text': {'field': 'method'}}
+                        }
+                    ]
+                }, use_container_width=True)
+            st.download_button("Download folded stacks", "\n".join(profile.folded_stacks()), file_name="stacks.folded")
+
+
+def _render_thread_dumps(manager):
+    """Render thread dump capture, state counts, identical-stack groups and a diff with the previous dump"""
+    runs = manager.list_thread_dump_runs()
+    if not st.session_state.is_running and not runs:
+        return
+    
+    with st.expander("🧵 Thread Dumps"):
+        if st.session_state.is_running and st.button("Capture thread dump"):
+            success, message = manager.capture_thread_dump(st.session_state.container_name)
+            (st.success if success else st.error)(message)
+            runs = manager.list_thread_dump_runs()
+        if not runs:
+            return
+        
+        run = st.selectbox("Run", runs, key="thread_dump_run")
+        dump_files = manager.list_thread_dumps(run)
+        if not dump_files:
+            return
+        index = st.selectbox(
+            "Dump", range(len(dump_files)), index=len(dump_files) - 1,
+            format_func=lambda i: os.path.basename(dump_files[i])[:-4], key=f"thread_dump_{run}"
+        )
+        dump = manager.load_thread_dump(dump_files[index])
+        
+        counts = dump.state_counts()
+        if not counts:
+            st.caption("No threads found in this dump")
+            return
+        columns = st.columns(len(counts))
+        for column, (state, count) in zip(columns, sorted(counts.items())):
+            column.metric(state, count)
+        
+        st.markdown(f"**Identical stacks** ({len(dump)} threads)")
+        for state, frames, names in dump.stack_groups()[:20]:
+            title = f"{len(names)} × {state}: {frames[0] if frames else '(no Java frames)'}"
+            with st.container(border=True):
+                st.caption(title)
+                st.code("\n".join(frames) or "(no Java frames)", language="plaintext")
+                st.caption(", ".join(names[:20]) + (f" and {len(names) - 20} more" if len(names) > 20 else ""))
+        
+        if index == 0:
+            st.caption("Capture another dump to compare with this one")
+            return
+        diff = diff_thread_dumps(manager.load_thread_dump(dump_files[index - 1]), dump)
+        st.markdown(f"**Compared with {os.path.basename(dump_files[index - 1])[:-4]}**")
+        col1, col2, col3, col4, col5 = st.columns(5)
+        col1.metric("Stuck", len(diff['stuck']), help="Same frames and still RUNNABLE or BLOCKED")
+        col2.metric("Unchanged", len(diff['unchanged']))
+        col3.metric("Changed", len(diff['changed']))
+        col4.metric("New", len(diff['new']))
+        col5.metric("Ended", len(diff['ended']))
+        if diff['stuck']:
+            st.warning("Threads stuck in the same frame:")
+            st.dataframe([
+                {'Thread': thread['name'], 'State': thread['state'], 'Frame': thread['frames'][0],
+                 'CPU since last dump (ms)': thread.get('cpu_delta_ms')}
+                for thread in diff['stuck']
+            ], hide_index=True)
+
+
+def _render_archived_runs(manager):
+    """Render a pager and search over archived (compressed) run logs"""
+    runs = manager.list_archived_runs()
+    if not runs:
+        return
+    
+    with st.expander(f"🗄️ Archived Runs ({len(runs)})"):
+        labels = {
+            run['run_id']: f"{run['run_id']} - {run['lines']} lines, {run['compressed_size'] / 1024:.0f} KiB compressed"
+            for run in runs
+        }
+        run_id = st.selectbox("Run", list(labels), format_func=labels.get, key="archived_run")
+        archived = manager.open_archived_log(run_id)
+        
+        query = st.text_input("Search this run", key="archived_search", placeholder="regex")
+        if query:
+            try:
+                lines = archived.search(re.compile(query.encode('utf-8'), re.IGNORECASE), LOG_SEARCH_LIMIT)
+            except re.error as e:
+                st.error(f"Invalid regex: {e}")
+                lines = []
+            st.caption(f"{len(lines)} matching lines (first {LOG_SEARCH_LIMIT} shown)")
+            if lines:
+                st.code("\n".join(
+                    f"{line + 1:>8}: {archived.get_lines(line, line + 1).rstrip()}" for line in lines
+                ), language="plaintext")
+        
+        pages = max(1, (archived.line_count + FINAL_LOG_PAGE_LINES - 1) // FINAL_LOG_PAGE_LINES)
+        page = st.number_input("Page", min_value=1, max_value=pages, value=1, key=f"archived_page_{run_id}")
+        start = (page - 1) * FINAL_LOG_PAGE_LINES
+        end = min(start + FINAL_LOG_PAGE_LINES, archived.line_count)
+        st.caption(f"Lines {start + 1}-{end} of {archived.line_count}")
+        st.code(archived.get_lines(start, end), language="plaintext")
+
+
+def _render_run_history(manager):
+    """Render a table of recent runs from the run registry"""
+    runs = manager.list_runs(limit=RUN_HISTORY_LIMIT)
+    if not runs:
+        return
+    
+    with st.expander(f"📜 Run History ({len(runs)})"):
+        statuses = sorted({run['status'] for run in runs})
+        status = st.selectbox("Status", ["all"] + statuses, key="run_history_status")
+        if status != "all":
+            runs = manager.list_runs(limit=RUN_HISTORY_LIMIT, status=status)
+        st.dataframe([
+            {
+                'Run': run['id'],
+                'Container': run['container_name'],
+                'Started': run['start_time'],
+                'Ended': run['end_time'],
+                'Status': run['status'],
+                'Exit code': run['exit_code'],
+                'Iterations': run['iterations_logged'],
+                'Iter/s': round(run['iterations_per_sec'], 2) if run['iterations_per_sec'] is not None else None,
+                'p99 gap (ms)': run['p99_gap_ms'],
+                'Max gap (s)': run['max_gap_s'],
+                'Stalls': run['stall_count'],
+                'Archive': run['archive_run_id']
+            }
+            for run in runs
+        ], hide_index=True)
 
 
 def _render_stop_button(manager):
@@ -96,41 +751,34 @@ def _render_stop_button(manager):
     if st.button("🛑 Stop Application"):
         success, message = manager.stop_java_app(st.session_state.container_name)
         if success:
-            st.session_state.is_running = False
-            manager.clear_process_state()
-            st.success(message)
-            time.sleep(1)
-            st.rerun()
+            _finish_run(manager, [("success", message)], "stopped")
         else:
             st.error(message)
 
 
-def _stream_live_logs(manager):
-    """Stream and display live logs"""
+def _stream_live_logs(manager, buffer):
+    """Display the live log window"""
     if st.session_state.log_file:
-        content = manager.read_logs(st.session_state.log_file)
-        if content:
+        if len(buffer):
             st.subheader("Application Logs (Live)")
             log_container = st.empty()
-            log_container.code(content, language="plaintext")
-        
-        # Auto-refresh to show live logs
-        time.sleep(1)
-        st.rerun()
+            log_container.code(buffer.text(), language="plaintext")
+            _render_older_logs(manager, buffer)
 
 
 def _render_input_fields():
-    """Render input fields for log message and iterations"""
+    """Render input fields for log message, iterations and GC logging"""
     col1, col2 = st.columns(2)
     with col1:
         log_message = st.text_input("Log Message", value="Hello from Docker!")
     with col2:
         iterations = st.number_input("Iterations", min_value=1, max_value=400, value=20)
+    gc_logging = st.checkbox("Write a GC log (-Xlog:gc*)", value=False)
     
-    return log_message, iterations
+    return log_message, iterations, gc_logging
 
 
-def _render_build_run_button(manager, log_message, iterations):
+def _render_build_run_button(manager, log_message, iterations, gc_logging):
     """Render build & run button and handle execution"""
     button_disabled = st.session_state.is_running
     if st.button("Build & Run Java App", disabled=button_disabled):
@@ -143,27 +791,51 @@ def _render_build_run_button(manager, log_message, iterations):
         java_app_dir = os.path.join(os.getcwd(), "java_app")
         host_log_file = os.path.join(java_app_dir, "app_host.log")
         
-        # Prepare log file
+        # Prepare log file and the GC log directory
         manager.prepare_log_file(host_log_file)
+        manager.prepare_gc_log(GC_LOG_DIR)
 
-        # Build image
-        success, message = manager.build_image(java_app_dir)
+        # Build image, rendering each step as it completes
+        success, message = _run_build(manager, status_text, java_app_dir)
         if not success:
             status_text.error(f"❌ {message}")
             st.session_state.is_running = False
-            manager.clear_process_state()
         else:
             status_text.success(f"✅ {message}")
             time.sleep(1)
             
             # Get or create container and execute
-            _execute_java_app(manager, status_text, log_message, iterations, host_log_file)
+            _execute_java_app(manager, status_text, log_message, iterations, host_log_file, gc_logging)
 
 
-def _execute_java_app(manager, status_text, log_message, iterations, host_log_file):
+def _run_build(manager, status_text, java_app_dir):
+    """Stream the image build, showing per-step cache use and timing"""
+    steps_table = st.empty()
+    steps = []
+    for event in manager.build_image_stream(java_app_dir):
+        if event['event'] == 'result':
+            return event['success'], event['message']
+        if event['event'] == 'context':
+            st.caption(f"Build context: {len(event['files'])} files, {event['size'] / 1024:.1f} KiB")
+            continue
+        
+        steps.append({
+            'Step': f"{event['step']}/{event['total']}",
+            'Instruction': event['instruction'],
+            'Cache': "hit" if event['cached'] else "miss",
+            'Duration (s)': round(event['duration'], 2)
+        })
+        status_text.info(f"🔨 Building Docker image... step {event['step']}/{event['total']}")
+        steps_table.table(steps)
+    return False, "Build produced no result"
+
+
+def _execute_java_app(manager, status_text, log_message, iterations, host_log_file, gc_logging=False):
     """Execute Java application in container"""
     try:
-        container, action = manager.get_or_create_container(log_message, iterations, host_log_file)
+        container, action = manager.get_or_create_container(
+            log_message, iterations, host_log_file, host_gc_dir=GC_LOG_DIR
+        )
         
         if action == "reused":
             status_text.info(f"♻️ Reusing running container: {manager.container_name}")
@@ -171,23 +843,32 @@ def _execute_java_app(manager, status_text, log_message, iterations, host_log_fi
             status_text.info(f"▶️ Starting stopped container: {manager.container_name}")
         elif action == "created":
             status_text.info(f"🚀 Creating new container: {manager.container_name}")
+        elif action == "recreated":
+            status_text.info(f"🔁 Recreating container with the GC log mount: {manager.container_name}")
         
         time.sleep(1)
         
         # Execute Java app
         status_text.info("☕ Starting Java application...")
-        success, message = manager.execute_java_app(container, log_message, iterations)
+        success, message = manager.execute_java_app(container, log_message, iterations, gc_logging)
         
         if success:
             # Save state
             start_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            st.session_state.process_pid = None
+            exec_info = manager.inspect_java_exec()
+            pid = exec_info.get('Pid') if exec_info else None
+            st.session_state.process_pid = pid
             st.session_state.is_running = True
             st.session_state.log_file = host_log_file
             st.session_state.start_time = start_time
             st.session_state.container_name = manager.container_name
+            st.session_state.run_outcome = []
+            st.session_state.status_poller = None
             
-            manager.save_process_state(None, host_log_file, start_time, True, manager.container_name)
+            manager.save_process_state(
+                pid, host_log_file, start_time, True, manager.container_name,
+                exec_id=manager.get_java_exec_id(), log_message=log_message, iterations=iterations
+            )
             
             status_text.success(f"✅ Java application started in container: {manager.container_name}")
             time.sleep(1)
@@ -195,12 +876,10 @@ def _execute_java_app(manager, status_text, log_message, iterations, host_log_fi
         else:
             status_text.error(f"❌ {message}")
             st.session_state.is_running = False
-            manager.clear_process_state()
             
     except Exception as e:
         status_text.error(f"❌ Unexpected error: {str(e)}")
         st.session_state.is_running = False
-        manager.clear_process_state()
 
 
 def _render_remove_container_button(manager):
@@ -0,0 +1,71 @@
+import streamlit as st
+import os
+from lib.JavaContainerFleet import JavaContainerFleet
+from ui.java_container_ui import get_java_manager
+
+
+def render_java_fleet_section():
+    """Render the Java Fleet section UI"""
+    st.title("🚢 Java Container Fleet")
+    st.markdown("Run the Java application in several containers at once and watch them together.")
+
+    manager = get_java_manager()
+    fleet = JavaContainerFleet(manager)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        count = st.number_input("Containers", min_value=1, max_value=100, value=5)
+    with col2:
+        log_message = st.text_input("Log Message", value="Hello from the fleet!")
+    with col3:
+        iterations = st.number_input("Iterations", min_value=1, max_value=400, value=20)
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        if st.button("🚀 Launch Fleet"):
+            _launch_fleet(manager, fleet, int(count), log_message, int(iterations))
+    with col2:
+        st.button("🔄 Refresh")
+    with col3:
+        if st.button("🛑 Stop All"):
+            _report_results(fleet.stop())
+    with col4:
+        if st.button("🗑️ Remove All"):
+            _report_results(fleet.remove())
+
+    _render_fleet_table(fleet)
+
+
+def _launch_fleet(manager, fleet, count, log_message, iterations):
+    """Build the image once, then start every fleet container concurrently"""
+    status_text = st.empty()
+    status_text.info("🔨 Building Docker image...")
+    success, message = manager.build_image(os.path.join(os.getcwd(), "java_app"))
+    if not success:
+        status_text.error(f"❌ {message}")
+        return
+
+    status_text.info(f"🚀 Launching {count} containers...")
+    results = fleet.launch(count, log_message, iterations)
+    started = sum(1 for _, ok, _ in results if ok)
+    status_text.success(f"✅ Started {started}/{count} containers")
+    _report_results(results)
+
+
+def _report_results(results):
+    """Show per-container failures from a fleet operation"""
+    for name, success, message in results:
+        if not success:
+            st.error(f"❌ {name}: {message}")
+
+
+def _render_fleet_table(fleet):
+    """Render the fleet status table"""
+    rows = fleet.status()
+    if not rows:
+        st.info("No fleet containers yet")
+        return
+
+    running = sum(1 for row in rows if row['Java'] == "running")
+    st.subheader(f"Fleet Status ({running}/{len(rows)} running)")
+    st.dataframe(rows, use_container_width=True)